@@ -0,0 +1,440 @@
+import { createLiveIndex } from './liveIndex.js';
+
+// Mirrors src/card_search.py so the API and Python rank cards the same way
+
+// Card fields searched as free text, and fields exposed as facets
+export const TEXT_FIELDS = ["summary", "keywords", "use_cases", "model_limitations"];
+export const FACET_FIELDS = ["model_type", "clinical_risk_level", "regulatory_status"];
+
+const BM25_K1 = 1.2;
+const BM25_B = 0.75;
+
+// Impact lists are re-sorted when the real average card length drifts this far
+// from the one they were scored with
+const AVG_LENGTH_DRIFT = 0.1;
+
+const TOKEN_RE = /[a-z0-9]+/g;
+const STOPWORDS = new Set([
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "with",
+]);
+const FACET_PLACEHOLDERS = new Set(["not found", "unknown", "n/a"]);
+
+export function tokenize(text) {
+    return (text.toLowerCase().match(TOKEN_RE) || []).filter((token) => !STOPWORDS.has(token));
+}
+
+function fieldText(value) {
+    if (value === null || value === undefined) return "";
+    if (Array.isArray(value)) return value.map(fieldText).join(" ");
+    return String(value);
+}
+
+// Each value once, so a card listing a value twice is still counted once
+function facetValues(value) {
+    const items = Array.isArray(value) ? value : [value];
+    return [...new Set(items
+        .filter((item) => item !== null && item !== undefined)
+        .map((item) => String(item).trim())
+        .filter((item) => item && !FACET_PLACEHOLDERS.has(item.toLowerCase())))];
+}
+
+// Impact list order: highest term weight first, then card id, like Python's (-weight, card_id) tuples
+function compareImpacts(a, b) {
+    if (a[0] !== b[0]) return a[0] - b[0];
+    return a[1] < b[1] ? -1 : a[1] > b[1] ? 1 : 0;
+}
+
+function bisectLeft(list, entry) {
+    let low = 0;
+    let high = list.length;
+    while (low < high) {
+        const middle = (low + high) >> 1;
+        if (compareImpacts(list[middle], entry) < 0) low = middle + 1;
+        else high = middle;
+    }
+    return low;
+}
+
+function intersection(a, b) {
+    const [smaller, larger] = a.size <= b.size ? [a, b] : [b, a];
+    const result = new Set();
+    smaller.forEach((cardId) => { if (larger.has(cardId)) result.add(cardId); });
+    return result;
+}
+
+function intersectionSize(a, b) {
+    const [smaller, larger] = a.size <= b.size ? [a, b] : [b, a];
+    let size = 0;
+    smaller.forEach((cardId) => { if (larger.has(cardId)) size++; });
+    return size;
+}
+
+// Min-heap of [score, cardId] that keeps only the best `limit` entries
+class TopK {
+    constructor(limit) {
+        this.limit = limit;
+        this.items = [];
+    }
+
+    get full() {
+        return this.items.length >= this.limit;
+    }
+
+    get min() {
+        return this.items[0][0];
+    }
+
+    push(score, cardId) {
+        const items = this.items;
+        if (items.length < this.limit) {
+            items.push([score, cardId]);
+            let i = items.length - 1;
+            while (i > 0) {
+                const parent = (i - 1) >> 1;
+                if (items[parent][0] <= items[i][0]) break;
+                [items[parent], items[i]] = [items[i], items[parent]];
+                i = parent;
+            }
+        } else if (this.limit > 0 && score > items[0][0]) {
+            items[0] = [score, cardId];
+            let i = 0;
+            for (;;) {
+                const left = 2 * i + 1;
+                const right = left + 1;
+                let smallest = i;
+                if (left < items.length && items[left][0] < items[smallest][0]) smallest = left;
+                if (right < items.length && items[right][0] < items[smallest][0]) smallest = right;
+                if (smallest === i) break;
+                [items[smallest], items[i]] = [items[i], items[smallest]];
+                i = smallest;
+            }
+        }
+    }
+
+    // Best first
+    sorted() {
+        return [...this.items]
+            .sort((a, b) => b[0] - a[0] || (a[1] < b[1] ? 1 : a[1] > b[1] ? -1 : 0))
+            .map(([score, cardId]) => [cardId, score]);
+    }
+}
+
+export class CardSearchIndex {
+    constructor() {
+        this.postings = new Map();      // term -> Map(cardId -> term frequency)
+        this.impacts = new Map();       // term -> sorted [[-term weight, cardId]]
+        this.docTerms = new Map();      // cardId -> Map(term -> term frequency)
+        this.docLengths = new Map();
+        this.totalLength = 0;
+        this.scoringAvgLength = 0;      // average length the impact lists were built with
+        this.facets = new Map(FACET_FIELDS.map((field) => [field, new Map()]));  // field -> value -> Set(cardId)
+        this.docFacets = new Map();     // cardId -> { field: [values] }
+        this.names = new Map();
+    }
+
+    get size() {
+        return this.docLengths.size;
+    }
+
+    // Add a card, replacing any earlier version with the same _id
+    upsert(card) {
+        const cardId = this.add(card);
+        if (this.avgLengthDrifted()) {
+            this.rebuildImpacts();
+        } else {
+            const length = this.docLengths.get(cardId);
+            this.docTerms.get(cardId).forEach((count, term) => {
+                if (!this.impacts.has(term)) this.impacts.set(term, []);
+                const impacts = this.impacts.get(term);
+                const entry = [-this.termWeight(count, length), cardId];
+                impacts.splice(bisectLeft(impacts, entry), 0, entry);
+            });
+        }
+        return cardId;
+    }
+
+    // Add many cards at once, sorting the impact lists a single time
+    upsertMany(cards) {
+        cards.forEach((card) => this.add(card));
+        this.rebuildImpacts();
+    }
+
+    // Index a card's postings and facets; the caller updates the impact lists
+    add(card) {
+        const cardId = String(card._id || card.name);
+        this.remove(cardId);
+
+        const text = TEXT_FIELDS.map((field) => fieldText(card[field])).join(" ");
+        const terms = new Map();
+        tokenize(text).forEach((term) => terms.set(term, (terms.get(term) || 0) + 1));
+        let length = 0;
+        terms.forEach((count, term) => {
+            if (!this.postings.has(term)) this.postings.set(term, new Map());
+            this.postings.get(term).set(cardId, count);
+            length += count;
+        });
+        this.docTerms.set(cardId, terms);
+        this.docLengths.set(cardId, length);
+        this.totalLength += length;
+
+        const docFacets = {};
+        FACET_FIELDS.forEach((field) => {
+            docFacets[field] = facetValues(card[field]);
+            const values = this.facets.get(field);
+            docFacets[field].forEach((value) => {
+                if (!values.has(value)) values.set(value, new Set());
+                values.get(value).add(cardId);
+            });
+        });
+        this.docFacets.set(cardId, docFacets);
+        this.names.set(cardId, card.name || card.model_name);
+        return cardId;
+    }
+
+    // Drop a card from the index if it is present
+    remove(cardId) {
+        if (!this.docTerms.has(cardId)) return;
+        const length = this.docLengths.get(cardId);
+        this.docTerms.get(cardId).forEach((count, term) => {
+            const postings = this.postings.get(term);
+            postings.delete(cardId);
+            const impacts = this.impacts.get(term);
+            if (impacts) {
+                const entry = [-this.termWeight(count, length), cardId];
+                const position = bisectLeft(impacts, entry);
+                if (position < impacts.length && compareImpacts(impacts[position], entry) === 0) {
+                    impacts.splice(position, 1);
+                }
+            }
+            if (postings.size === 0) {
+                this.postings.delete(term);
+                this.impacts.delete(term);
+            }
+        });
+        this.docTerms.delete(cardId);
+        this.totalLength -= length;
+        this.docLengths.delete(cardId);
+
+        Object.entries(this.docFacets.get(cardId)).forEach(([field, values]) => {
+            const fieldValues = this.facets.get(field);
+            values.forEach((value) => {
+                const ids = fieldValues.get(value);
+                ids.delete(cardId);
+                if (ids.size === 0) fieldValues.delete(value);
+            });
+        });
+        this.docFacets.delete(cardId);
+        this.names.delete(cardId);
+    }
+
+    // filters maps a facet field to a value or an array of values (any one may match).
+    // Returns { total, results: [{ id, name, score }], facets: { field: { value: count } } }
+    search(query = "", filters = {}, limit = 10) {
+        const allowed = this.filterIds(filters);
+        const queryTerms = [...new Set(tokenize(query || ""))];
+        const terms = queryTerms.filter((term) => this.postings.has(term));
+
+        let matched;
+        let top;
+        if (queryTerms.length > 0) {
+            matched = new Set();
+            const postingLists = terms.map((term) => this.postings.get(term));
+            const postingCount = postingLists.reduce((sum, postings) => sum + postings.size, 0);
+            if (allowed !== null && allowed.size < postingCount) {
+                // A narrow facet filter: check its cards against the postings instead
+                allowed.forEach((cardId) => {
+                    if (postingLists.some((postings) => postings.has(cardId))) matched.add(cardId);
+                });
+            } else {
+                postingLists.forEach((postings) => {
+                    postings.forEach((count, cardId) => {
+                        if (allowed === null || allowed.has(cardId)) matched.add(cardId);
+                    });
+                });
+            }
+            top = terms.length > 0 ? this.topK(terms, allowed, limit) : [];
+        } else {
+            // No text query: every card passing the filters matches equally. Without filters
+            // the card lengths map stands in for the set of all cards; only its size and keys are used
+            matched = allowed !== null ? allowed : this.docLengths;
+            top = [];
+            for (const cardId of matched.keys()) {
+                if (top.length >= limit) break;
+                top.push([cardId, 0]);
+            }
+        }
+
+        return {
+            total: matched.size,
+            results: top.map(([cardId, score]) => ({
+                id: cardId,
+                name: this.names.get(cardId),
+                score: Math.round(score * 10000) / 10000,
+            })),
+            facets: this.facetCounts(matched, queryTerms.length > 0 || allowed !== null),
+        };
+    }
+
+    // BM25 weight of a term in a card, before multiplying by the term's idf
+    termWeight(freq, length) {
+        const norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (this.scoringAvgLength || 1));
+        return freq * (BM25_K1 + 1) / (freq + norm);
+    }
+
+    idf(term) {
+        const docCount = this.docLengths.size;
+        const matches = this.postings.get(term).size;
+        return Math.log(1 + (docCount - matches + 0.5) / (matches + 0.5));
+    }
+
+    avgLengthDrifted() {
+        const avgLength = this.docLengths.size ? this.totalLength / this.docLengths.size : 0;
+        if (!this.scoringAvgLength) return avgLength > 0;
+        return Math.abs(avgLength - this.scoringAvgLength) > AVG_LENGTH_DRIFT * this.scoringAvgLength;
+    }
+
+    // Rescore every impact list against the current average card length
+    rebuildImpacts() {
+        this.scoringAvgLength = this.docLengths.size ? this.totalLength / this.docLengths.size : 0;
+        this.impacts = new Map();
+        this.postings.forEach((postings, term) => {
+            const impacts = [];
+            postings.forEach((count, cardId) => {
+                impacts.push([-this.termWeight(count, this.docLengths.get(cardId)), cardId]);
+            });
+            this.impacts.set(term, impacts.sort(compareImpacts));
+        });
+    }
+
+    // Best `limit` [cardId, score] pairs. The term weights at the current depth of each
+    // impact list bound the score of any card not seen yet; the walk stops once the
+    // k-th best score reaches that bound
+    topK(terms, allowed, limit) {
+        if (limit <= 0) return [];
+        const lists = terms.map((term) => ({
+            idf: this.idf(term),
+            impacts: this.impacts.get(term),
+            postings: this.postings.get(term),
+        }));
+        const scoreCard = (cardId) => {
+            const length = this.docLengths.get(cardId);
+            let score = 0;
+            lists.forEach(({ idf, postings }) => {
+                const freq = postings.get(cardId);
+                if (freq !== undefined) score += idf * this.termWeight(freq, length);
+            });
+            return score;
+        };
+        const best = new TopK(limit);
+
+        // Walking the lists visits about limit / (fraction of cards allowed) entries per list
+        // before the heap fills, and never more than every posting
+        const postingCount = lists.reduce((sum, { postings }) => sum + postings.size, 0);
+        const walkCost = allowed === null ? postingCount
+            : Math.min(postingCount, terms.length * limit * this.docLengths.size / Math.max(allowed.size, 1));
+        if (allowed !== null && allowed.size * terms.length < walkCost) {
+            // A narrow facet filter: scoring its few cards directly beats walking the lists
+            allowed.forEach((cardId) => {
+                if (lists.some(({ postings }) => postings.has(cardId))) best.push(scoreCard(cardId), cardId);
+            });
+            return best.sorted();
+        }
+
+        const seen = new Set();
+        const longest = Math.max(...lists.map(({ impacts }) => impacts.length));
+        for (let depth = 0; depth < longest; depth++) {
+            let bound = 0;
+            lists.forEach(({ idf, impacts }) => {
+                if (depth >= impacts.length) return;
+                const [weight, cardId] = impacts[depth];
+                bound -= idf * weight;
+                if (seen.has(cardId)) return;
+                seen.add(cardId);
+                if (allowed !== null && !allowed.has(cardId)) return;
+                best.push(scoreCard(cardId), cardId);
+            });
+            if (best.full && best.min >= bound) break;
+        }
+        return best.sorted();
+    }
+
+    // Intersect the card id sets of the requested facets, taking the union of a field's
+    // values when it lists several; null means no filter.
+    // The result may be one of the index's own sets, so callers must not modify it
+    filterIds(filters) {
+        let allowed = null;
+        Object.entries(filters || {}).forEach(([field, value]) => {
+            const values = (Array.isArray(value) ? value : [value]).filter((item) => item);
+            if (!this.facets.has(field) || values.length === 0) return;
+            const idSets = values.map((item) => this.facets.get(field).get(item) || new Set());
+            const ids = idSets.length === 1 ? idSets[0] : new Set(idSets.flatMap((set) => [...set]));
+            allowed = allowed === null ? ids : intersection(allowed, ids);
+        });
+        return allowed;
+    }
+
+    // Count facet values over the matched cards, using the same three strategies as Python
+    facetCounts(matched, filtered) {
+        const counts = {};
+        FACET_FIELDS.forEach((field) => { counts[field] = {}; });
+
+        if (!filtered) {
+            this.facets.forEach((values, field) => {
+                values.forEach((ids, value) => { counts[field][value] = ids.size; });
+            });
+            return counts;
+        }
+
+        let distinctValues = 0;
+        this.facets.forEach((values) => { distinctValues += values.size; });
+
+        if (2 * matched.size > this.docLengths.size) {
+            // Most cards match: count each value's misses against the small unmatched set
+            const unmatched = new Set();
+            this.docLengths.forEach((length, cardId) => {
+                if (!matched.has(cardId)) unmatched.add(cardId);
+            });
+            this.facets.forEach((values, field) => {
+                values.forEach((ids, value) => {
+                    const count = ids.size - intersectionSize(ids, unmatched);
+                    if (count) counts[field][value] = count;
+                });
+            });
+        } else if (distinctValues < matched.size) {
+            // Few distinct values: intersect each value's id set with the matches
+            this.facets.forEach((values, field) => {
+                values.forEach((ids, value) => {
+                    const count = intersectionSize(ids, matched);
+                    if (count) counts[field][value] = count;
+                });
+            });
+        } else {
+            matched.forEach((cardId) => {
+                Object.entries(this.docFacets.get(cardId)).forEach(([field, values]) => {
+                    values.forEach((value) => {
+                        counts[field][value] = (counts[field][value] || 0) + 1;
+                    });
+                });
+            });
+        }
+        return counts;
+    }
+}
+
+// Shared index over the stored cards: loaded once, then kept current by liveIndex.js
+export const getCardIndex = (() => {
+    let getIndex = null;
+    return (collection) => {
+        if (!getIndex) {
+            getIndex = createLiveIndex(collection, {
+                fields: ["name", "model_name", ...TEXT_FIELDS, ...FACET_FIELDS],
+                create: () => new CardSearchIndex(),
+                upsert: (index, card) => index.upsert(card),
+                upsertMany: (index, cards) => index.upsertMany(cards),
+                remove: (index, cardId) => index.remove(cardId),
+            });
+        }
+        return getIndex();
+    };
+})();
@@ -0,0 +1,128 @@
+// Keeps an in-memory index in step with a collection: one full load at startup,
+// then incremental updates in the background instead of periodic rebuilds
+
+// Used only when change streams are unavailable (e.g. a standalone MongoDB)
+const POLL_INTERVAL_MS = 30 * 1000;
+
+/**
+ * Returns a getter for a shared, incrementally maintained index
+ * @param {Collection} collection - MongoDB collection to follow
+ * @param {string[]} fields - document fields the index needs; nothing else is transferred
+ * @param {Function} create - () => new empty index
+ * @param {Function} upsert - (index, document) => void
+ * @param {Function} remove - (index, id) => void, id as a string
+ * @param {Function} [upsertMany] - (index, documents) => void, used for the initial load if given
+ */
+export function createLiveIndex(collection, { fields, create, upsert, remove, upsertMany }) {
+    const projection = Object.fromEntries(fields.map((field) => [field, 1]));
+    let indexPromise = null;
+
+    async function load() {
+        const index = create();
+        // Follow changes before the initial scan so nothing written during it is missed.
+        // Changes seen during the scan are held back and applied after it, so an older
+        // scanned copy never overwrites them; upserts replace by _id, so repeats are harmless
+        const state = { lastId: null, polling: false, stops: [], pending: [] };
+        follow(index, state);
+
+        try {
+            const cursor = collection.find({}, { projection, sort: { _id: 1 } });
+            if (upsertMany) {
+                const documents = await cursor.toArray();
+                upsertMany(index, documents);
+                if (documents.length) state.lastId = documents[documents.length - 1]._id;
+            } else {
+                for await (const document of cursor) {
+                    upsert(index, document);
+                    state.lastId = document._id;
+                }
+            }
+        } catch (error) {
+            // Stop following changes for an index that will be thrown away
+            state.stops.forEach((stop) => stop());
+            throw error;
+        }
+
+        const pending = state.pending;
+        state.pending = null;
+        pending.forEach((change) => change());
+        return index;
+    }
+
+    // Apply a change now, or after the initial scan if it is still running
+    function apply(state, change) {
+        if (state.pending) {
+            state.pending.push(change);
+        } else {
+            change();
+        }
+    }
+
+    function follow(index, state) {
+        const pipeline = [{
+            $project: {
+                operationType: 1,
+                documentKey: 1,
+                ...Object.fromEntries(fields.map((field) => [`fullDocument.${field}`, 1])),
+            },
+        }];
+        let stream;
+        try {
+            stream = collection.watch(pipeline, { fullDocument: 'updateLookup' });
+        } catch (error) {
+            poll(index, state);
+            return;
+        }
+        state.stops.push(() => stream.close().catch(() => {}));
+
+        stream.on('change', (change) => {
+            if (change.operationType === 'delete') {
+                apply(state, () => remove(index, String(change.documentKey._id)));
+            } else if (change.fullDocument) {
+                const document = { _id: change.documentKey._id, ...change.fullDocument };
+                apply(state, () => upsert(index, document));
+            }
+        });
+        stream.on('error', (error) => {
+            console.error('⚠️  Change stream unavailable, polling for new cards instead:', error.message);
+            stream.close().catch(() => {});
+            poll(index, state);
+        });
+    }
+
+    // Fallback: pick up newly inserted cards by _id order
+    function poll(index, state) {
+        if (state.polling) return;
+        state.polling = true;
+        let running = false;
+        const timer = setInterval(async () => {
+            if (running) return;
+            running = true;
+            try {
+                const query = state.lastId ? { _id: { $gt: state.lastId } } : {};
+                const cursor = collection.find(query, { projection, sort: { _id: 1 } });
+                for await (const document of cursor) {
+                    apply(state, () => upsert(index, document));
+                    state.lastId = document._id;
+                }
+            } catch (error) {
+                console.error('❌ Error polling for new cards:', error.message);
+            } finally {
+                running = false;
+            }
+        }, POLL_INTERVAL_MS);
+        timer.unref();
+        state.stops.push(() => clearInterval(timer));
+    }
+
+    // Concurrent callers share one in-flight load; a failed load is retried on the next call
+    return function getIndex() {
+        if (!indexPromise) {
+            indexPromise = load().catch((error) => {
+                indexPromise = null;
+                throw error;
+            });
+        }
+        return indexPromise;
+    };
+}
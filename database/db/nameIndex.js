@@ -0,0 +1,274 @@
+import fs from 'fs';
+import path from 'path';
+import { fileURLToPath } from 'url';
+import { createLiveIndex } from './liveIndex.js';
+
+// Mirrors src/name_index.py so the API and the CLI resolve names the same way
+
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+
+// Alias table shared with the Python side, at the project root
+const ALIASES_FILE = path.join(__dirname, '../../model_aliases.json');
+
+const DEFAULT_SIMILARITY_THRESHOLD = 0.75;
+
+// A trailing "v1" / "v1.0" / "version 1" names the same model as no version at all
+const DEFAULT_VERSION_RE = /\s*\b(v|version\s*)1(\.0+)*\s*$/;
+const NON_ALNUM_RE = /[^a-z0-9]+/g;
+const DIGITS_RE = /\d+/g;
+
+// A fuzzy match may only differ by a typo inside a word at least this long,
+// allowing one edit per this many characters (at least one)
+const MIN_TYPO_WORD_LENGTH = 5;
+const CHARS_PER_TYPO = 6;
+
+// e.g. "BiomedCLIP ViT-B" -> ["biomedclip", "vit", "b"]
+export function nameWords(name) {
+    if (!name) return [];
+    return String(name)
+        .normalize('NFKD')
+        .replace(/\p{M}/gu, '')
+        .toLowerCase()
+        .trim()
+        .replace(DEFAULT_VERSION_RE, '')
+        .split(NON_ALNUM_RE)
+        .filter((word) => word);
+}
+
+export function canonicalName(name) {
+    return nameWords(name).join('');
+}
+
+function trigrams(key) {
+    const padded = `  ${key}  `;
+    const grams = new Set();
+    for (let i = 0; i < padded.length - 2; i++) {
+        grams.add(padded.slice(i, i + 3));
+    }
+    return grams;
+}
+
+function digits(key) {
+    return (key.match(DIGITS_RE) || []).join(',');
+}
+
+// True if one key is the other with extra characters added at either end
+function isExtension(key, other) {
+    if (key === other) return false;
+    const [shorter, longer] = key.length <= other.length ? [key, other] : [other, key];
+    return longer.startsWith(shorter) || longer.endsWith(shorter);
+}
+
+function editDistance(a, b) {
+    let previous = Array.from({ length: b.length + 1 }, (_, j) => j);
+    for (let i = 1; i <= a.length; i++) {
+        const current = [i];
+        for (let j = 1; j <= b.length; j++) {
+            current.push(Math.min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] !== b[j - 1])));
+        }
+        previous = current;
+    }
+    return previous[b.length];
+}
+
+// True if two names differ by a whole word rather than a typo,
+// e.g. "ViT-B" vs "ViT-L" or "Classifier Tiny" vs "Classifier Base"
+function differsByWord(words, other) {
+    // Compare only the stretch between the words both names share at either end
+    const shortest = Math.min(words.length, other.length);
+    let start = 0;
+    while (start < shortest && words[start] === other[start]) start++;
+    let end = 0;
+    while (end < shortest - start && words[words.length - 1 - end] === other[other.length - 1 - end]) end++;
+    const middle = words.slice(start, words.length - end).join('');
+    const otherMiddle = other.slice(start, other.length - end).join('');
+
+    const shorter = Math.min(middle.length, otherMiddle.length);
+    if (shorter < MIN_TYPO_WORD_LENGTH) return true;
+    return editDistance(middle, otherMiddle) > Math.max(1, Math.floor(shorter / CHARS_PER_TYPO));
+}
+
+function loadAliases() {
+    try {
+        return JSON.parse(fs.readFileSync(ALIASES_FILE, 'utf8'));
+    } catch (error) {
+        if (error.code !== 'ENOENT') {
+            console.error('❌ Error reading alias file:', error.message);
+        }
+        return {};
+    }
+}
+
+export class ModelNameIndex {
+    constructor(names = [], aliases = {}, threshold = DEFAULT_SIMILARITY_THRESHOLD) {
+        this.threshold = threshold;
+        this.names = new Set();
+        this.aliases = new Map();
+        this.byKey = new Map();
+        this.keyTrigrams = new Map();
+        this.postings = new Map();
+        this.namesById = new Map();     // card _id -> stored name, for live updates
+
+        names.forEach((name) => this.add(name));
+        Object.entries(aliases).forEach(([name, nameAliases]) => {
+            nameAliases.forEach((alias) => this.addAlias(alias, name));
+        });
+    }
+
+    get size() {
+        return this.names.size;
+    }
+
+    add(name) {
+        if (!name || this.names.has(name)) return;
+        this.names.add(name);
+
+        const key = canonicalName(name);
+        if (!key || this.byKey.has(key)) return;
+        this.byKey.set(key, name);
+
+        const grams = trigrams(key);
+        this.keyTrigrams.set(key, grams);
+        grams.forEach((gram) => {
+            if (!this.postings.has(gram)) this.postings.set(gram, new Set());
+            this.postings.get(gram).add(key);
+        });
+    }
+
+    remove(name) {
+        if (!this.names.delete(name)) return;
+
+        const key = canonicalName(name);
+        if (this.byKey.get(key) !== name) return;
+        this.keyTrigrams.get(key).forEach((gram) => {
+            const keys = this.postings.get(gram);
+            keys.delete(key);
+            if (keys.size === 0) this.postings.delete(gram);
+        });
+        this.byKey.delete(key);
+        this.keyTrigrams.delete(key);
+
+        // Another stored name with the same canonical key takes over
+        const sibling = [...this.names].find((other) => canonicalName(other) === key);
+        if (sibling) {
+            this.names.delete(sibling);
+            this.add(sibling);
+        }
+    }
+
+    // Track a stored card so a later rename or delete updates the index
+    upsertDocument(document) {
+        const id = String(document._id);
+        const previous = this.namesById.get(id);
+        if (previous === document.name) return;
+        if (previous !== undefined) this.removeDocument(id);
+        if (typeof document.name !== 'string') return;
+        this.namesById.set(id, document.name);
+        this.add(document.name);
+    }
+
+    removeDocument(id) {
+        const name = this.namesById.get(id);
+        if (name === undefined) return;
+        this.namesById.delete(id);
+        // Keep the name if another card still uses it
+        if (![...this.namesById.values()].includes(name)) this.remove(name);
+    }
+
+    addAlias(alias, name) {
+        const key = canonicalName(alias);
+        if (key) this.aliases.set(key, name);
+    }
+
+    // Returns { name, score, matchType }, with name null if nothing is close enough
+    resolve(query) {
+        if (this.names.has(query)) {
+            return { name: query, score: 1, matchType: 'exact' };
+        }
+
+        const key = canonicalName(query);
+        if (!key) return { name: null, score: 0, matchType: null };
+        if (this.aliases.has(key)) {
+            return { name: this.aliases.get(key), score: 1, matchType: 'alias' };
+        }
+        if (this.byKey.has(key)) {
+            return { name: this.byKey.get(key), score: 1, matchType: 'canonical' };
+        }
+
+        const { matchKey, score } = this.bestFuzzyMatch(query, key);
+        if (matchKey === null) return { name: null, score: 0, matchType: null };
+        return { name: this.byKey.get(matchKey), score, matchType: 'fuzzy' };
+    }
+
+    bestFuzzyMatch(query, key) {
+        const queryGrams = trigrams(key);
+        const querySize = queryGrams.size;
+        const threshold = this.threshold;
+
+        // Dice >= t bounds the candidate's trigram count and the overlap it needs
+        const minSize = querySize * threshold / (2 - threshold);
+        const maxSize = querySize * (2 - threshold) / threshold;
+        const minOverlap = Math.max(1, Math.ceil(threshold * (querySize + minSize) / 2));
+
+        // Any key with minOverlap shared trigrams must appear in one of the
+        // (querySize - minOverlap + 1) rarest posting lists
+        const postingSize = (gram) => (this.postings.get(gram) || new Set()).size;
+        const rarest = [...queryGrams].sort((a, b) => postingSize(a) - postingSize(b));
+        const candidates = new Set();
+        rarest.slice(0, querySize - minOverlap + 1).forEach((gram) => {
+            (this.postings.get(gram) || []).forEach((candidate) => candidates.add(candidate));
+        });
+
+        const queryDigits = digits(key);
+        const queryWords = nameWords(query);
+        let matchKey = null;
+        let bestScore = 0;
+        candidates.forEach((candidate) => {
+            const grams = this.keyTrigrams.get(candidate);
+            if (grams.size < minSize || grams.size > maxSize) return;
+
+            let shared = 0;
+            queryGrams.forEach((gram) => {
+                if (grams.has(gram)) shared++;
+            });
+            const score = 2 * shared / (querySize + grams.size);
+            // Never merge names that differ in a version or size number, a variant suffix or a whole word
+            if (score > bestScore && score >= threshold
+                && digits(candidate) === queryDigits
+                && !isExtension(key, candidate)
+                && !differsByWord(queryWords, nameWords(this.byKey.get(candidate)))) {
+                matchKey = candidate;
+                bestScore = score;
+            }
+        });
+        return { matchKey, score: bestScore };
+    }
+}
+
+// Shared index over the stored card names: loaded once, then kept current by liveIndex.js
+export const getNameIndex = (() => {
+    let getIndex = null;
+    return (collection) => {
+        if (!getIndex) {
+            getIndex = createLiveIndex(collection, {
+                fields: ["name"],
+                create: () => new ModelNameIndex([], loadAliases()),
+                upsert: (index, document) => index.upsertDocument(document),
+                remove: (index, id) => index.removeDocument(id),
+            });
+        }
+        return getIndex();
+    };
+})();
+
+// Map a requested model name onto the stored name it refers to, if any.
+// Returns { lookupName, requestedName, matchType, score } so callers can report substitutions
+export async function resolveModelName(collection, modelName) {
+    const index = await getNameIndex(collection);
+    const { name, score, matchType } = index.resolve(modelName);
+    if (name && name !== modelName) {
+        console.log(`🔗 Resolved '${modelName}' to '${name}' (${matchType} match, score ${score.toFixed(2)})`);
+    }
+    return { lookupName: name || modelName, requestedName: modelName, matchType, score };
+}
@@ -1,9 +1,20 @@
 import express from "express";
 import { spawn } from 'child_process';
+import { ObjectId } from "mongodb";
 import db from "../db/connection.js";
+import { getNameIndex, resolveModelName } from "../db/nameIndex.js";
+import { FACET_FIELDS, getCardIndex } from "../db/cardSearch.js";
 
 const router = express.Router();
 
+// Load the indexes at startup so no request waits for the initial scan
+getNameIndex(db.collection("ModelCardInfo")).catch((error) => {
+    console.error("❌ Error loading model name index:", error.message);
+});
+getCardIndex(db.collection("ModelCardInfo")).catch((error) => {
+    console.error("❌ Error loading card search index:", error.message);
+});
+
 // Get all model cards
 router.get("/model-cards", async (req, res) => {
     try {
@@ -20,6 +31,54 @@ router.get("/model-cards", async (req, res) => {
     }
 });
 
+// Search model cards by text and facets, e.g. /search?q=skin+lesion&clinical_risk_level=High.
+// Repeating a facet matches any of its values: ?model_type=Classifier&model_type=Segmentation
+router.get("/search", async (req, res) => {
+    const isString = (value) => typeof value === "string";
+    const invalid = ["q", "limit", ...FACET_FIELDS].filter((field) => {
+        const value = req.query[field];
+        if (value === undefined) return false;
+        // Facets may repeat; q and limit are single values
+        return FACET_FIELDS.includes(field)
+            ? !(isString(value) || (Array.isArray(value) && value.every(isString)))
+            : !isString(value);
+    });
+    if (invalid.length > 0) {
+        return res.status(400).json({ error: `Invalid query parameter(s): ${invalid.join(", ")}` });
+    }
+
+    const query = req.query.q || "";
+    const limit = Math.max(1, Math.min(parseInt(req.query.limit, 10) || 10, 100));
+    const filters = Object.fromEntries(
+        FACET_FIELDS.filter((field) => req.query[field]).map((field) => [field, req.query[field]])
+    );
+
+    try {
+        const collection = db.collection("ModelCardInfo");
+        const index = await getCardIndex(collection);
+        const { total, results, facets } = index.search(query, filters, limit);
+
+        // Only the ranked page of cards is loaded from the database
+        const ids = results.map((result) => result.id).filter((id) => ObjectId.isValid(id));
+        const cards = await collection.find({ _id: { $in: ids.map((id) => new ObjectId(id)) } }).toArray();
+        const cardsById = new Map(cards.map((card) => [String(card._id), card]));
+
+        res.json({
+            total,
+            results: results
+                .filter((result) => cardsById.has(result.id))
+                .map((result) => ({ score: result.score, data: cardsById.get(result.id) })),
+            facets
+        });
+    } catch (error) {
+        console.error("API Error:", error);
+        res.status(500).json({ 
+            error: "Internal server error",
+            details: error.message 
+        });
+    }
+});
+
 // Generate new model card
 router.post("/model-card", async (req, res) => {
     const { modelName, developerName } = req.body;
@@ -29,15 +88,22 @@ router.post("/model-card", async (req, res) => {
     }
 
     try {
-        // First check if model exists in database
+        // First check if model exists in database, allowing for spelling variants of the name
         const collection = db.collection("ModelCardInfo");
-        const existingModel = await collection.findOne({ name: modelName });
+        const match = await resolveModelName(collection, modelName);
+        const existingModel = await collection.findOne({ name: match.lookupName });
         
         if (existingModel) {
-            // Return existing model from database
+            // Return existing model from database, noting when a different spelling was matched
             return res.json({
                 source: 'database',
                 data: existingModel,
+                match: {
+                    requestedName: match.requestedName,
+                    matchedName: match.lookupName,
+                    matchType: match.matchType,
+                    score: match.score
+                },
                 timestamp: Date.now()
             });
         }
@@ -72,6 +138,8 @@ router.post("/model-card", async (req, res) => {
                 const newModel = await collection.findOne({ name: modelName });
                 
                 if (newModel) {
+                    (await getNameIndex(collection)).upsertDocument(newModel);
+                    (await getCardIndex(collection)).upsert(newModel);
                     res.json({
                         source: 'generated',
                         data: newModel,
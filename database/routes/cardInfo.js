@@ -3,6 +3,7 @@ import express from "express";
 
 // This will help us connect to the database
 import db from "../db/connection.js";
+import { resolveModelName } from "../db/nameIndex.js";
 
 
 // This help convert the id from string to ObjectId for the _id.
@@ -15,9 +16,17 @@ const router = express.Router();
 
 router.get("/:name", async(req, res) => {
     let collection = await db.collection("ModelCardInfo");
-    let query = { name: req.params.name };
+    let match = await resolveModelName(collection, req.params.name);
+    let query = { name: match.lookupName };
     let result = await collection.findOne(query);
 
+    // Let callers see when a different spelling of the name was matched
+    if (match.matchType) {
+        res.set("X-Name-Match-Type", match.matchType);
+        res.set("X-Name-Match-Score", String(match.score));
+        res.set("X-Matched-Name", encodeURIComponent(match.lookupName));
+    }
+
     if (!result) res.send("Not found").status(404);
         else res.send(result).status(200);
 });
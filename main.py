@@ -5,6 +5,7 @@ import os
 from datetime import datetime
 from pymongo import MongoClient
 from dotenv import load_dotenv
+from src.name_index import build_name_index
 
 # Load environment variables
 load_dotenv()
@@ -27,13 +28,32 @@ def connect_to_database():
         print(f"❌ Database connection error: {str(e)}")
         return None
 
-def check_model_exists(db, model_name):
+def load_name_index(db):
+    """Build the model name index from the names stored in the database"""
+    try:
+        name_index = build_name_index(db.ModelCardInfo)
+        print(f"📇 Indexed {len(name_index)} model name(s)")
+        return name_index
+    except Exception as e:
+        print(f"❌ Error building model name index: {str(e)}")
+        return None
+
+def check_model_exists(db, model_name, name_index=None):
     """Check if model exists in the database"""
     try:
         collection = db.ModelCardInfo
-        query = {"name": model_name}
         
-        print(f"🔍 Checking database for model: '{model_name}'")
+        # Resolve spelling variants to the stored name before querying
+        lookup_name = model_name
+        if name_index is not None:
+            resolved_name, score, match_type = name_index.resolve(model_name)
+            if resolved_name and resolved_name != model_name:
+                print(f"🔗 Resolved '{model_name}' to '{resolved_name}' ({match_type} match, score {score:.2f})")
+                lookup_name = resolved_name
+        
+        query = {"name": lookup_name}
+        
+        print(f"🔍 Checking database for model: '{lookup_name}'")
         result = collection.find_one(query)
         
         if result:
@@ -161,8 +181,9 @@ def main():
         success = run_generate_model(model_name, developer_name)
         return
     
-    # Check if model exists in database using same logic as test_card_info.js
-    exists, model_data = check_model_exists(db, model_name)
+    # Check if model exists in database, allowing for spelling variants of the name
+    name_index = load_name_index(db)
+    exists, model_data = check_model_exists(db, model_name, name_index)
     
     if exists:
         # Model exists in database
@@ -178,7 +199,7 @@ def main():
         if success:
             # Check if the model was added to database after generation
             print("\n🔍 Checking if model was added to database...")
-            exists_now, new_data = check_model_exists(db, model_name)
+            exists_now, new_data = check_model_exists(db, model_name, name_index)
             if exists_now:
                 print("✅ Model successfully added to database!")
             else:
@@ -0,0 +1,340 @@
+import bisect
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from itertools import islice
+
+# Card fields searched as free text, and fields exposed as facets.
+# Kept in sync with database/db/cardSearch.js
+TEXT_FIELDS = ["summary", "keywords", "use_cases", "model_limitations"]
+FACET_FIELDS = ["model_type", "clinical_risk_level", "regulatory_status"]
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Impact lists are re-sorted when the real average card length drifts this far
+# from the one they were scored with
+AVG_LENGTH_DRIFT = 0.1
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "that", "the", "this", "to", "with",
+}
+
+
+def tokenize(text):
+    """Split text into lowercase search terms"""
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def field_text(value):
+    """Flatten a card field (string or list) into plain text"""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return " ".join(field_text(item) for item in value)
+    return str(value)
+
+
+def facet_values(value):
+    """Return the distinct facet values of a card field, ignoring placeholders"""
+    items = value if isinstance(value, list) else [value]
+    values = []
+    for item in items:
+        if item is None:
+            continue
+        item = str(item).strip()
+        if item and item.lower() not in ("not found", "unknown", "n/a") and item not in values:
+            values.append(item)
+    return values
+
+
+class CardSearchIndex:
+    """
+    In-memory inverted index over model cards with BM25 ranking and facet counts.
+    Cards are upserted one at a time, so the index never needs a full rebuild.
+
+    Besides the term -> {card_id: tf} postings, each term keeps an impact list:
+    its cards sorted by BM25 term weight. A query walks the lists best-first and
+    stops once no unseen card can beat the current top k (Fagin's threshold
+    algorithm), so common terms like "model" do not mean scoring every card.
+    """
+
+    def __init__(self):
+        self.postings = defaultdict(dict)     # term -> {card_id: term frequency}
+        self.impacts = defaultdict(list)      # term -> sorted [(-term weight, card_id)]
+        self.doc_terms = {}                   # card_id -> Counter of terms
+        self.doc_lengths = {}
+        self.total_length = 0
+        self.scoring_avg_length = 0.0         # average length the impact lists were built with
+        self.facets = {field: defaultdict(set) for field in FACET_FIELDS}   # field -> value -> card ids
+        self.doc_facets = {}                  # card_id -> {field: [values]}
+        self.names = {}
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def upsert(self, card):
+        """Add a card, replacing any earlier version with the same _id"""
+        card_id = self._add(card)
+        if self._avg_length_drifted():
+            self._rebuild_impacts()
+        else:
+            length = self.doc_lengths[card_id]
+            for term, count in self.doc_terms[card_id].items():
+                bisect.insort(self.impacts[term], (-self._term_weight(count, length), card_id))
+        return card_id
+
+    def upsert_many(self, cards):
+        """Add many cards at once, sorting the impact lists a single time"""
+        for card in cards:
+            self._add(card)
+        self._rebuild_impacts()
+
+    def _add(self, card):
+        """Index a card's postings and facets; the caller updates the impact lists"""
+        card_id = str(card.get("_id") or card.get("name"))
+        self.remove(card_id)
+
+        text = " ".join(field_text(card.get(field)) for field in TEXT_FIELDS)
+        terms = Counter(tokenize(text))
+        for term, count in terms.items():
+            self.postings[term][card_id] = count
+        self.doc_terms[card_id] = terms
+        self.doc_lengths[card_id] = sum(terms.values())
+        self.total_length += self.doc_lengths[card_id]
+
+        doc_facets = {}
+        for field in FACET_FIELDS:
+            doc_facets[field] = facet_values(card.get(field))
+            for value in doc_facets[field]:
+                self.facets[field][value].add(card_id)
+        self.doc_facets[card_id] = doc_facets
+        self.names[card_id] = card.get("name") or card.get("model_name")
+        return card_id
+
+    def remove(self, card_id):
+        """Drop a card from the index if it is present"""
+        if card_id not in self.doc_terms:
+            return
+        length = self.doc_lengths[card_id]
+        for term, count in self.doc_terms.pop(card_id).items():
+            postings = self.postings[term]
+            postings.pop(card_id, None)
+            impacts = self.impacts[term]
+            entry = (-self._term_weight(count, length), card_id)
+            position = bisect.bisect_left(impacts, entry)
+            if position < len(impacts) and impacts[position] == entry:
+                del impacts[position]
+            if not postings:
+                del self.postings[term]
+                del self.impacts[term]
+        self.total_length -= self.doc_lengths.pop(card_id)
+
+        for field, values in self.doc_facets.pop(card_id).items():
+            for value in values:
+                ids = self.facets[field][value]
+                ids.discard(card_id)
+                if not ids:
+                    del self.facets[field][value]
+        self.names.pop(card_id, None)
+
+    def search(self, query="", filters=None, limit=10):
+        """
+        Rank cards for a text query, restricted to the facet filters
+        filters maps a facet field to a value or a list of values, e.g.
+        {"clinical_risk_level": "High", "model_type": ["Classifier", "Segmentation"]};
+        a card must match every field and any one of a field's values
+        Returns {"total", "results": [{"id", "name", "score"}], "facets": {field: {value: count}}}
+        """
+        allowed = self._filter_ids(filters or {})
+        query_terms = set(tokenize(query or ""))
+        terms = [term for term in query_terms if term in self.postings]
+
+        if query_terms:
+            posting_lists = [self.postings[term] for term in terms]
+            if allowed is not None and len(allowed) < sum(len(postings) for postings in posting_lists):
+                # A narrow facet filter: check its cards against the postings instead
+                matched = {card_id for card_id in allowed if any(card_id in postings for postings in posting_lists)}
+            else:
+                matched = set().union(*(postings.keys() for postings in posting_lists))
+                if allowed is not None:
+                    matched &= allowed
+            top = self._top_k(terms, allowed, limit) if terms else []
+        else:
+            # No text query: every card passing the filters matches equally
+            matched = allowed if allowed is not None else self.doc_lengths.keys()
+            top = [(card_id, 0.0) for card_id in islice(matched, limit)]
+
+        return {
+            "total": len(matched),
+            "results": [
+                {"id": card_id, "name": self.names.get(card_id), "score": round(score, 4)}
+                for card_id, score in top
+            ],
+            "facets": self._facet_counts(matched, filtered=bool(query_terms) or allowed is not None),
+        }
+
+    def _filter_ids(self, filters):
+        """
+        Intersect the card id sets of the requested facets, taking the union of a
+        field's values when it lists several; None means no filter
+        """
+        allowed = None
+        for field, value in filters.items():
+            values = [value] if isinstance(value, str) else list(value or ())
+            values = [value for value in values if value]
+            if field not in self.facets or not values:
+                continue
+            ids = set().union(*(self.facets[field].get(value, ()) for value in values))
+            allowed = ids if allowed is None else allowed & ids
+        return allowed
+
+    def _term_weight(self, freq, length):
+        """BM25 weight of a term in a card, before multiplying by the term's idf"""
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (self.scoring_avg_length or 1))
+        return freq * (BM25_K1 + 1) / (freq + norm)
+
+    def _idf(self, term):
+        doc_count = len(self.doc_lengths)
+        matches = len(self.postings[term])
+        return math.log(1 + (doc_count - matches + 0.5) / (matches + 0.5))
+
+    def _avg_length_drifted(self):
+        avg_length = self.total_length / len(self.doc_lengths) if self.doc_lengths else 0.0
+        if not self.scoring_avg_length:
+            return avg_length > 0
+        return abs(avg_length - self.scoring_avg_length) > AVG_LENGTH_DRIFT * self.scoring_avg_length
+
+    def _rebuild_impacts(self):
+        """Rescore every impact list against the current average card length"""
+        self.scoring_avg_length = self.total_length / len(self.doc_lengths) if self.doc_lengths else 0.0
+        self.impacts = defaultdict(list)
+        for term, postings in self.postings.items():
+            self.impacts[term] = sorted(
+                (-self._term_weight(count, self.doc_lengths[card_id]), card_id)
+                for card_id, count in postings.items()
+            )
+
+    def _top_k(self, terms, allowed, limit):
+        """
+        Return the limit best (card_id, score) pairs, best first.
+        The term weights at the current depth of each impact list bound the
+        score of any card not seen yet; the walk stops once the k-th best
+        score reaches that bound.
+        """
+        if limit <= 0:
+            return []
+        lists = [(self._idf(term), self.impacts[term]) for term in terms]
+        scored = [(idf, self.postings[term]) for term, (idf, _) in zip(terms, lists)]
+        doc_lengths = self.doc_lengths
+
+        # Walking the lists visits about limit / (fraction of cards allowed) entries per
+        # list before the heap fills, and never more than every posting
+        posting_count = sum(len(postings) for _, postings in scored)
+        if allowed is not None and len(allowed) * len(terms) < min(
+                posting_count, len(terms) * limit * len(doc_lengths) / max(len(allowed), 1)):
+            # A narrow facet filter: scoring its few cards directly beats walking the lists
+            scores = {}
+            for card_id in allowed:
+                length = doc_lengths[card_id]
+                weights = [idf * self._term_weight(postings[card_id], length)
+                           for idf, postings in scored if card_id in postings]
+                if weights:
+                    scores[card_id] = sum(weights)
+            return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        longest = max(len(impacts) for _, impacts in lists)
+
+        heap = []
+        seen = set()
+        for depth in range(longest):
+            bound = 0.0
+            for idf, impacts in lists:
+                if depth >= len(impacts):
+                    continue
+                weight, card_id = impacts[depth]
+                bound -= idf * weight
+                if card_id in seen:
+                    continue
+                seen.add(card_id)
+                if allowed is not None and card_id not in allowed:
+                    continue
+
+                length = doc_lengths[card_id]
+                score = sum(
+                    idf_ * self._term_weight(postings[card_id], length)
+                    for idf_, postings in scored if card_id in postings
+                )
+                if len(heap) < limit:
+                    heapq.heappush(heap, (score, card_id))
+                elif score > heap[0][0]:
+                    heapq.heapreplace(heap, (score, card_id))
+
+            if len(heap) == limit and heap[0][0] >= bound:
+                break
+
+        return [(card_id, score) for score, card_id in sorted(heap, reverse=True)]
+
+    def _facet_counts(self, matched, filtered):
+        """Count facet values over the matched cards"""
+        if not filtered:
+            return {
+                field: {value: len(ids) for value, ids in values.items()}
+                for field, values in self.facets.items()
+            }
+
+        counts = {field: defaultdict(int) for field in FACET_FIELDS}
+        if 2 * len(matched) > len(self.doc_lengths):
+            # Most cards match: count each value's misses against the small unmatched set
+            unmatched = self.doc_lengths.keys() - matched
+            for field, values in self.facets.items():
+                for value, ids in values.items():
+                    count = len(ids) - len(ids & unmatched)
+                    if count:
+                        counts[field][value] = count
+        elif sum(len(values) for values in self.facets.values()) < len(matched):
+            # Few distinct values: intersect each value's id set with the matches
+            matched = matched if isinstance(matched, set) else set(matched)
+            for field, values in self.facets.items():
+                for value, ids in values.items():
+                    count = len(ids & matched)
+                    if count:
+                        counts[field][value] = count
+        else:
+            for card_id in matched:
+                for field, values in self.doc_facets[card_id].items():
+                    for value in values:
+                        counts[field][value] += 1
+        return {field: dict(field_counts) for field, field_counts in counts.items()}
+
+
+def build_card_index(collection):
+    """Build a search index from the cards stored in the database, loading only the indexed fields"""
+    projection = {field: 1 for field in ["name", "model_name"] + TEXT_FIELDS + FACET_FIELDS}
+    index = CardSearchIndex()
+    index.upsert_many(collection.find({}, projection))
+    return index
+
+
+if __name__ == "__main__":
+    # Query the stored cards from the command line
+    import os
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+
+    load_dotenv()
+    client = MongoClient(os.getenv('ATLAS_URI'), serverSelectionTimeoutMS=5000)
+    card_index = build_card_index(client.ModelCards.ModelCardInfo)
+    print(f"📇 Indexed {len(card_index)} model card(s)")
+
+    query = input("Enter a search query: ").strip()
+    response = card_index.search(query)
+    print(f"\n🔍 {response['total']} match(es)")
+    for result in response["results"]:
+        print(f"   • {result['name']} ({result['score']})")
+    for field, counts in response["facets"].items():
+        print(f"\n📊 {field.replace('_', ' ').title()}:")
+        for value, count in sorted(counts.items(), key=lambda item: -item[1]):
+            print(f"   • {value}: {count}")
@@ -3,11 +3,21 @@ import json
 import csv
 from dotenv import load_dotenv
 import google.generativeai as genai
+from src.llm_router import GeminiBackend, ModelTier, TieredExtractor
 
 # Load environment variables from .env file
 load_dotenv()
 
-def setup_gemini_api():
+# Model tiers tried in order; later tiers only see fields the earlier ones
+# could not answer confidently. Prices are USD per million tokens.
+MODEL_TIERS = [
+    {"name": "fast", "model": os.getenv('GEMINI_FAST_MODEL', 'gemini-2.0-flash-lite'),
+     "input_cost_per_1m": 0.075, "output_cost_per_1m": 0.30},
+    {"name": "strong", "model": os.getenv('GEMINI_STRONG_MODEL', 'gemini-2.0-flash'),
+     "input_cost_per_1m": 0.10, "output_cost_per_1m": 0.40},
+]
+
+def setup_gemini_api(model_name='gemini-2.0-flash'):
     """Setup and configure Gemini API"""
     api_key = os.getenv('GEMINI_API_KEY')
     
@@ -19,11 +29,25 @@ def setup_gemini_api():
     
     try:
         # Initialize the model
-        model = genai.GenerativeModel('gemini-2.0-flash')
+        model = genai.GenerativeModel(model_name)
         return model
     except Exception as e:
         raise Exception(f"Failed to initialize Gemini model: {str(e)}")
 
+def setup_model_router():
+    """Setup the tiered Gemini router used for field extraction"""
+    tiers = [
+        ModelTier(
+            tier["name"],
+            GeminiBackend(setup_gemini_api(tier["model"])),
+            model_id=tier["model"],
+            input_cost_per_1m=tier["input_cost_per_1m"],
+            output_cost_per_1m=tier["output_cost_per_1m"],
+        )
+        for tier in MODEL_TIERS
+    ]
+    return TieredExtractor(tiers)
+
 def load_wanted_fields():
     """Load the wanted fields from CSV file"""
     try:
@@ -43,74 +67,15 @@ def load_wanted_fields():
         print(f"❌ Error reading CSV file: {str(e)}")
         return []
 
-def create_extraction_prompt(scraped_content, wanted_fields, model_name=None, developer_name=None):
-    """Create a prompt for Gemini to extract model card information"""
-    
-    fields_str = ", ".join(wanted_fields)
-    
-    
-    # Add context about the provided model and developer names
-    context_info = ""
-    if model_name or developer_name:
-        context_info = f"""
-        **Additional Context:**
-        • Provided Model Name: {model_name if model_name else 'Not provided'}
-        • Provided Developer Name: {developer_name if developer_name else 'Not provided'}
-
-        Use this information to help validate or supplement what you find in the website content.
-        """
-            
-        prompt = f"""
-        You are an AI assistant specialized in extracting information from web content to create comprehensive AI model cards. Your goal is to be as thorough and helpful as possible.
-
-        I have scraped content from a website about an AI model, and I need you to extract specific information fields.
-
-        **Website Content:**
-        {scraped_content}
-        {context_info}
-        **Required Fields to Extract:**
-        {fields_str}
-
-        **Instructions:**
-        1. Analyze the provided website content carefully and extract explicit information
-        2. Use your best judgment and domain knowledge to make educated guesses when information is not explicitly stated
-        3. For missing information, make reasonable inferences based on:
-        - The type of AI model described
-        - Common practices in the field
-        - Context clues from the content
-        - Industry standards for similar models
-        4. Only use "Not found" as a last resort when no reasonable inference can be made
-        5. Return results in valid JSON format with field names as keys
-        6. Be thorough - aim to populate as many fields as possible with meaningful information
-        7. For dates, use YYYY-MM-DD format if possible, or estimate based on context
-        8. For keywords, provide comprehensive, relevant terms related to the model and its domain
-        9. For technical fields, make educated guesses based on the model type and application
-        10. For regulatory/compliance fields, consider the model's intended use and typical requirements
-
-        **Guidelines for Making Educated Guesses:**
-        - If it's a medical/healthcare AI, consider typical clinical validation requirements
-        - If it's a foundation model, consider common training approaches and datasets
-        - For intended users, think about who would typically use this type of model
-        - For limitations, consider common limitations of similar AI models
-        - For ethical considerations, think about typical concerns for this model type
-        - For performance metrics, consider what would be standard for this domain
-
-        **Expected JSON Output Format:**
-        Return a complete JSON object with ALL fields from the CSV, making your best educated guesses where needed.
-
-        Please provide only the JSON output, no additional text or explanations. Be comprehensive and thorough.
-        """
-    print(prompt)
-    return prompt
-
-def extract_model_info(scraped_data, model_name=None, developer_name=None):
-    """Extract model card information using Gemini API"""
+def extract_model_info(scraped_data, model_name=None, developer_name=None, router=None):
+    """Extract model card information using the tiered Gemini router"""
     
     print("🤖 Setting up Gemini API...")
     
     try:
-        # Setup Gemini API
-        model = setup_gemini_api()
+        # Setup Gemini model tiers
+        if router is None:
+            router = setup_model_router()
         
         # Load wanted fields
         wanted_fields = load_wanted_fields()
@@ -133,53 +98,33 @@ def extract_model_info(scraped_data, model_name=None, developer_name=None):
         print(f"📄 Content length: {len(content)} characters")
         print(f"Content: " + (content[:1000] + "..." if len(content) > 1000 else content))
         
-        # Create extraction prompt with model and developer context
-        prompt = create_extraction_prompt(content, wanted_fields, model_name, developer_name)
+        print("🔍 Sending requests to Gemini API...")
         
-        print("🔍 Sending request to Gemini API...")
+        # Each tier gets a compact prompt with the content and just the fields routed to it
+        extracted_info, routing_report = router.extract(wanted_fields, content, model_name, developer_name)
         
-        # Generate response using Gemini
-        response = model.generate_content(prompt)
-        
-        if not response or not response.text:
-            return {"error": "Empty response from Gemini API"}
+        # Like a single failed Gemini call before, fail only when no tier returned a usable response;
+        # a response full of "Not found" answers is still saved
+        tier_stats = routing_report["tiers"].values()
+        if any(stats["calls"] for stats in tier_stats) and all(stats["calls"] == stats["failed_calls"] for stats in tier_stats):
+            return {
+                "error": "No usable response from Gemini API",
+                "routing_report": routing_report
+            }
         
         print("✅ Received response from Gemini API")
-        print(f"Raw response: {response.text}")
+        print(f"💰 Routing cost: ${routing_report['total_cost_usd']:.6f}, latency: {routing_report['total_latency_s']:.2f}s, "
+              f"round trips: {routing_report['rounds']}")
         
-        # Parse the JSON response - handle markdown code blocks
-        try:
-            response_text = response.text.strip()
-            
-            # Remove markdown code blocks if present
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]  # Remove ```json
-            elif response_text.startswith("```"):
-                response_text = response_text[3:]   # Remove ```
-            
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]  # Remove trailing ```
-            
-            response_text = response_text.strip()
-            
-            extracted_info = json.loads(response_text)
-            
-            # Add metadata
-            extracted_info["extraction_timestamp"] = scraped_data.get("timestamp")
-            extracted_info["source_url"] = scraped_data.get("url")
-            extracted_info["extraction_method"] = "Gemini API"
-            extracted_info["provided_model_name"] = model_name
-            extracted_info["provided_developer_name"] = developer_name
-            
-            return extracted_info
-            
-        except json.JSONDecodeError as e:
-            print(f"❌ Failed to parse JSON response: {str(e)}")
-            print(f"Cleaned response: {response_text}")
-            return {
-                "error": "Failed to parse JSON response from Gemini",
-                "raw_response": response.text
-            }
+        # Add metadata
+        extracted_info["extraction_timestamp"] = scraped_data.get("timestamp")
+        extracted_info["source_url"] = scraped_data.get("url")
+        extracted_info["extraction_method"] = "Gemini API (tiered)"
+        extracted_info["provided_model_name"] = model_name
+        extracted_info["provided_developer_name"] = developer_name
+        extracted_info["routing_report"] = routing_report
+        
+        return extracted_info
             
     except ValueError as e:
         return {"error": str(e)}
@@ -209,7 +154,7 @@ def display_extracted_info(extracted_info):
         return
     
     for key, value in extracted_info.items():
-        if key not in ["extraction_timestamp", "source_url", "extraction_method", "provided_model_name", "provided_developer_name"]:
+        if key not in ["extraction_timestamp", "source_url", "extraction_method", "provided_model_name", "provided_developer_name", "routing_report"]:
             print(f"📌 {key.replace('_', ' ').title()}: {value}")
     
     print("\n📋 Metadata:")
@@ -218,6 +163,15 @@ def display_extracted_info(extracted_info):
     print(f"   • Provided Model Name: {extracted_info.get('provided_model_name', 'N/A')}")
     print(f"   • Provided Developer Name: {extracted_info.get('provided_developer_name', 'N/A')}")
     print(f"   • Timestamp: {extracted_info.get('extraction_timestamp', 'N/A')}")
+    
+    routing_report = extracted_info.get("routing_report")
+    if routing_report:
+        print("\n🔀 Routing:")
+        for tier_name, stats in routing_report["tiers"].items():
+            print(f"   • {tier_name} ({stats['model']}): {stats['fields_accepted']}/{stats['fields_requested']} fields, "
+                  f"{stats['latency_s']:.2f}s, {stats['input_tokens'] + stats['output_tokens']} tokens, ${stats['cost_usd']:.6f}")
+        extractor_count = sum(1 for d in routing_report["decisions"].values() if d["source"] == "extractor")
+        print(f"   • extractors: {extractor_count} fields")
 
 if __name__ == "__main__":
     # Test with sample data (for development)
@@ -0,0 +1,385 @@
+import json
+import re
+import textwrap
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Placeholder answers that never count as a real value for a field
+EMPTY_VALUES = {
+    "", "not found", "unknown", "n/a", "none", "not specified", "not provided",
+    "unknown developer",  # placeholder main.py and the API send when no developer is given
+}
+
+# Fields whose answers need more domain reasoning; they skip the cheap tier
+# and go straight to the strongest one
+HARD_FIELDS = {
+    "efficacy_result", "efficacy_interpretation", "efficacy_test_type", "efficacy_testing_data", "efficacy_validation",
+    "auroc_accuracy", "auroc_interpretation", "auroc_test_type", "auroc_testing_data", "auroc_validation",
+    "safety_result", "safety_interpretation", "safety_test_type", "safety_testing_data", "safety_validation",
+    "bias_mitigation", "bias_mitigation_strategies", "known_biases", "clinical_risk_level", "regulatory_status",
+    "development_data_characterization", "relevance_to_population", "exclusion_inclusion_criteria",
+}
+
+DATE_FIELDS = {"release_date"}
+LIST_FIELDS = {"keywords", "use_cases", "primary_intended_users"}
+
+# Educated guesses (0.5) are accepted; only weaker answers escalate.
+# Bare values without a confidence are treated as educated guesses.
+DEFAULT_CONFIDENCE_THRESHOLD = 0.5
+UNRATED_CONFIDENCE = 0.5
+
+MONTHS = {
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6, "july": 7,
+    "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+}
+ISO_DATE_RE = re.compile(r"\b(\d{4})-(\d{2})-(\d{2})\b")
+LONG_DATE_RE = re.compile(r"\b(" + "|".join(MONTHS) + r")\s+(\d{1,2}),?\s+(\d{4})\b", re.IGNORECASE)
+DOI_RE = re.compile(r"\b10\.\d{4,9}/[^\s\"<>]+", re.IGNORECASE)
+
+# A regex hit only answers a field outright when one of these cues comes shortly before it;
+# otherwise it is passed to the model as a hint
+CUE_WINDOW = 60
+RELEASE_CUE_RE = re.compile(
+    r"\b(released?|release date|published|launched|version\b[^.\n]{0,30}\bdate)\b", re.IGNORECASE
+)
+DATASET_CUE_RE = re.compile(r"\b(datasets?|data sets?|data availability|training data|data source)\b", re.IGNORECASE)
+
+# Confidence given to hints, low enough that a model answer always wins
+HINT_CONFIDENCE = 0.3
+
+LIST_SEPARATOR_RE = re.compile(r"\s*[,;\n]\s*")
+
+# Each tier gets only the content and its own fields, so parallel and escalated
+# calls do not resend a long fixed instruction block. Confidence is only asked
+# for weak guesses, keeping the answers as short as plain values.
+TIER_PROMPT = """
+        AI model card extraction. {context}
+        **Website Content:**
+        {content}
+        **Fields:** {fields}
+        Return only a JSON object keyed by field name. Dates as YYYY-MM-DD{list_format}.
+        If the content is silent, give an educated guess from the model type and domain; "Not found" only as a last resort.
+        Give weak guesses as {{"value": <answer>, "confidence": <0-1>}} instead of a bare value.
+        """
+
+HINT_INSTRUCTIONS = """
+        **Candidate Values Found on the Page (verify before using, they may refer to something else):**
+        {hints}
+        """
+
+
+def parse_json_response(response_text):
+    """Parse a JSON object from a model response, stripping markdown code blocks"""
+    response_text = response_text.strip()
+
+    # Remove markdown code blocks if present
+    if response_text.startswith("```json"):
+        response_text = response_text[7:]
+    elif response_text.startswith("```"):
+        response_text = response_text[3:]
+
+    if response_text.endswith("```"):
+        response_text = response_text[:-3]
+
+    return json.loads(response_text.strip())
+
+
+def is_empty_value(value):
+    """Return True if a value is missing or a placeholder like 'Not found'"""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip().lower() in EMPTY_VALUES
+    if isinstance(value, (list, dict)):
+        return len(value) == 0
+    return False
+
+
+def normalize_value(field, value):
+    """Split a comma-separated answer for a list field into a list"""
+    if field in LIST_FIELDS and isinstance(value, str) and not is_empty_value(value):
+        return [item for item in LIST_SEPARATOR_RE.split(value.strip()) if item]
+    return value
+
+
+def validate_field(field, value):
+    """
+    Check a single extracted value
+    Returns (is_valid, reason)
+    """
+    if is_empty_value(value):
+        return False, "empty"
+    if field in DATE_FIELDS and not (isinstance(value, str) and ISO_DATE_RE.fullmatch(value.strip())):
+        return False, "date not in YYYY-MM-DD format"
+    if field in LIST_FIELDS and not isinstance(value, list):
+        return False, "expected a list"
+    return True, "ok"
+
+
+def has_cue(content, start, cue_re):
+    """Return True if the cue appears in the text just before position start"""
+    return bool(cue_re.search(content[max(0, start - CUE_WINDOW):start]))
+
+
+def find_dates(content):
+    """Return (position, YYYY-MM-DD) for every date in the content, in page order"""
+    dates = [(match.start(), match.group(0)) for match in ISO_DATE_RE.finditer(content)]
+    for match in LONG_DATE_RE.finditer(content):
+        month = MONTHS[match.group(1).lower()]
+        dates.append((match.start(), f"{match.group(3)}-{month:02d}-{int(match.group(2)):02d}"))
+    return sorted(dates)
+
+
+def extract_date(content):
+    """
+    Find the release date in the content
+    Returns (cued_date, first_date): the first date preceded by a release cue, and the first date at all
+    """
+    dates = find_dates(content)
+    cued = next((date for start, date in dates if has_cue(content, start, RELEASE_CUE_RE)), None)
+    return cued, dates[0][1] if dates else None
+
+
+def extract_dataset_doi(content):
+    """
+    Find the dataset DOI in the content
+    Returns (cued_doi, first_doi): the first DOI preceded by a dataset cue, and the first DOI at all
+    """
+    dois = [(match.start(), match.group(0).rstrip(".,;)")) for match in DOI_RE.finditer(content)]
+    cued = next((doi for start, doi in dois if has_cue(content, start, DATASET_CUE_RE)), None)
+    return cued, dois[0][1] if dois else None
+
+
+def run_deterministic_extractors(fields, content, model_name=None, developer_name=None):
+    """
+    Answer the fields that can be filled without an LLM call
+    Returns (values, hints); hints are uncued regex hits for the model to verify
+    """
+    content = content or ""
+    candidates = {
+        "model_name": model_name,
+        "developer_name": developer_name,
+    }
+    hints = {}
+
+    if "release_date" in fields:
+        candidates["release_date"], hints["release_date"] = extract_date(content)
+
+    if "doi_dataset_used" in fields:
+        candidates["doi_dataset_used"], hints["doi_dataset_used"] = extract_dataset_doi(content)
+
+    values = {
+        field: value for field, value in candidates.items()
+        if field in fields and validate_field(field, value)[0]
+    }
+    hints = {
+        field: value for field, value in hints.items()
+        if field not in values and validate_field(field, value)[0]
+    }
+    return values, hints
+
+
+def build_tier_prompt(fields, content, model_name=None, developer_name=None, hints=None):
+    """Build the extraction prompt for one tier's share of the fields"""
+    context = [
+        f"{label}: {value}" for label, value in (("Model", model_name), ("Developer", developer_name))
+        if not is_empty_value(value)
+    ]
+    list_fields = [field for field in fields if field in LIST_FIELDS]
+    prompt = textwrap.dedent(TIER_PROMPT).format(
+        context="; ".join(context),
+        content=content or "",
+        fields=", ".join(fields),
+        list_format=f"; JSON lists of strings for {', '.join(list_fields)}" if list_fields else "",
+    )
+    field_hints = [f"• {field}: {hints[field]}" for field in fields if field in (hints or {})]
+    if field_hints:
+        prompt += textwrap.dedent(HINT_INSTRUCTIONS).format(hints="\n".join(field_hints))
+    return prompt.strip()
+
+
+class GeminiBackend:
+    """Adapter that gives a Gemini GenerativeModel the backend interface used by the router"""
+
+    def __init__(self, model):
+        self.model = model
+
+    def generate(self, prompt):
+        """Return (text, input_tokens, output_tokens) for a prompt"""
+        response = self.model.generate_content(prompt)
+        usage = getattr(response, "usage_metadata", None)
+        input_tokens = getattr(usage, "prompt_token_count", 0) or 0
+        output_tokens = getattr(usage, "candidates_token_count", 0) or 0
+        return response.text, input_tokens, output_tokens
+
+
+class ModelTier:
+    """A named LLM backend with its per-million-token prices"""
+
+    def __init__(self, name, backend, model_id=None, input_cost_per_1m=0.0, output_cost_per_1m=0.0):
+        self.name = name
+        self.backend = backend
+        self.model_id = model_id or name
+        self.input_cost_per_1m = input_cost_per_1m
+        self.output_cost_per_1m = output_cost_per_1m
+
+    def cost(self, input_tokens, output_tokens):
+        """Return the USD cost of a call"""
+        return (input_tokens * self.input_cost_per_1m + output_tokens * self.output_cost_per_1m) / 1_000_000
+
+
+class TieredExtractor:
+    """
+    Fill model card fields from the cheapest source that gives a valid answer.
+    Deterministic extractors go first. Hard fields then go straight to the
+    strongest tier while the rest go to the cheapest, with both requests sent
+    in parallel. A field only moves on to the next tier when it is missing from
+    the response, its answer fails validation, or its reported confidence is
+    below the threshold; a confident "Not found" is accepted as it is.
+    """
+
+    def __init__(self, tiers, confidence_threshold=DEFAULT_CONFIDENCE_THRESHOLD):
+        if not tiers:
+            raise ValueError("❌ At least one model tier is required")
+        self.tiers = tiers
+        self.confidence_threshold = confidence_threshold
+
+    def extract(self, fields, content, model_name=None, developer_name=None):
+        """
+        Extract the given fields from the page content
+        Returns (values, routing_report)
+        """
+        started = time.perf_counter()
+        values = {}
+        decisions = {}
+        tier_stats = {
+            tier.name: {
+                "model": tier.model_id, "calls": 0, "failed_calls": 0, "fields_requested": 0,
+                "fields_accepted": 0, "latency_s": 0.0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0,
+            }
+            for tier in self.tiers
+        }
+
+        extracted, hints = run_deterministic_extractors(fields, content, model_name, developer_name)
+        for field, value in extracted.items():
+            values[field] = value
+            decisions[field] = {"source": "extractor", "confidence": 1.0, "attempts": []}
+
+        pending = [field for field in fields if field not in values]
+        # Uncued regex hits are kept as a low-confidence fallback
+        best_guess = {field: (value, HINT_CONFIDENCE, "extractor_hint") for field, value in hints.items()}
+        attempts = {field: [] for field in pending}
+        last_tier = len(self.tiers) - 1
+        current_tier = {field: last_tier if field in HARD_FIELDS else 0 for field in pending}
+        unresolved = []
+        rounds = 0
+
+        with ThreadPoolExecutor(max_workers=len(self.tiers)) as executor:
+            while pending:
+                rounds += 1
+                groups = defaultdict(list)
+                for field in pending:
+                    groups[current_tier[field]].append(field)
+
+                futures = {}
+                for index, group in sorted(groups.items()):
+                    tier = self.tiers[index]
+                    print(f"🔀 Routing {len(group)} field(s) to '{tier.name}' tier ({tier.model_id})")
+                    futures[index] = executor.submit(
+                        self._call_tier, tier, group, content, model_name, developer_name, hints,
+                        tier_stats[tier.name],
+                    )
+
+                pending = []
+                for index, group in sorted(groups.items()):
+                    tier = self.tiers[index]
+                    answers = futures[index].result()
+                    for field in group:
+                        attempts[field].append(tier.name)
+                        if field in answers:
+                            value, confidence = self._unpack_answer(answers[field])
+                            value = normalize_value(field, value)
+                            valid, reason = validate_field(field, value)
+                        else:
+                            value, confidence, valid, reason = None, 0.0, False, "no answer"
+                        confident = confidence >= self.confidence_threshold
+                        # A confident "Not found" is as final as a value; asking again rarely finds one
+                        if (valid and (confident or index == last_tier)) or (reason == "empty" and confident):
+                            values[field] = value if valid else "Not found"
+                            decisions[field] = {"source": tier.name, "confidence": confidence, "attempts": attempts[field]}
+                            tier_stats[tier.name]["fields_accepted"] += 1
+                            continue
+
+                        if valid and confidence > best_guess.get(field, (None, -1.0, None))[1]:
+                            best_guess[field] = (value, confidence, tier.name)
+                        decisions[field] = {
+                            "source": None,
+                            "confidence": confidence,
+                            "attempts": attempts[field],
+                            "reason": reason if not valid else "low confidence",
+                        }
+                        if index == last_tier:
+                            unresolved.append(field)
+                        else:
+                            current_tier[field] = index + 1
+                            pending.append(field)
+
+        # Fields no tier could answer confidently keep their best earlier guess
+        for field in unresolved:
+            if field in best_guess:
+                values[field], confidence, source = best_guess[field]
+                decisions[field].update({"source": source, "confidence": confidence})
+            else:
+                values[field] = "Not found"
+
+        report = {
+            "decisions": decisions,
+            "rounds": rounds,
+            "tiers": tier_stats,
+            "total_latency_s": round(time.perf_counter() - started, 3),
+            "total_cost_usd": round(sum(stats["cost_usd"] for stats in tier_stats.values()), 6),
+        }
+        return values, report
+
+    def _call_tier(self, tier, fields, content, model_name, developer_name, hints, stats):
+        """Send one batched request for the fields to a tier and record its spend"""
+        prompt = build_tier_prompt(fields, content, model_name, developer_name, hints)
+        stats["calls"] += 1
+        stats["fields_requested"] += len(fields)
+
+        start = time.perf_counter()
+        try:
+            text, input_tokens, output_tokens = tier.backend.generate(prompt)
+        except Exception as e:
+            print(f"❌ '{tier.name}' tier request failed: {str(e)}")
+            stats["failed_calls"] += 1
+            return {}
+        finally:
+            stats["latency_s"] = round(stats["latency_s"] + time.perf_counter() - start, 3)
+
+        stats["input_tokens"] += input_tokens
+        stats["output_tokens"] += output_tokens
+        stats["cost_usd"] = round(stats["cost_usd"] + tier.cost(input_tokens, output_tokens), 6)
+
+        try:
+            answers = parse_json_response(text or "")
+        except json.JSONDecodeError as e:
+            print(f"❌ Failed to parse JSON response from '{tier.name}' tier: {str(e)}")
+            stats["failed_calls"] += 1
+            return {}
+        if not isinstance(answers, dict):
+            stats["failed_calls"] += 1
+            return {}
+        return answers
+
+    @staticmethod
+    def _unpack_answer(answer):
+        """Split a {"value", "confidence"} answer; bare values count as educated guesses"""
+        if isinstance(answer, dict) and "value" in answer:
+            try:
+                confidence = float(answer.get("confidence", UNRATED_CONFIDENCE))
+            except (TypeError, ValueError):
+                confidence = UNRATED_CONFIDENCE
+            return answer["value"], max(0.0, min(1.0, confidence))
+        return answer, UNRATED_CONFIDENCE
@@ -0,0 +1,207 @@
+import json
+import os
+import re
+import unicodedata
+from collections import defaultdict
+
+# Alias table shared with the Express routes (database/db/nameIndex.js)
+ALIASES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'model_aliases.json')
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.75
+
+# A trailing "v1" / "v1.0" / "version 1" names the same model as no version at all
+DEFAULT_VERSION_RE = re.compile(r'\s*\b(v|version\s*)1(\.0+)*\s*$')
+NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+DIGITS_RE = re.compile(r'\d+')
+
+# A fuzzy match may only differ by a typo inside a word at least this long,
+# allowing one edit per this many characters (at least one)
+MIN_TYPO_WORD_LENGTH = 5
+CHARS_PER_TYPO = 6
+
+
+def name_words(name):
+    """Split a model name into normalized words, e.g. "BiomedCLIP ViT-B" -> ["biomedclip", "vit", "b"]"""
+    if not name:
+        return []
+    name = unicodedata.normalize('NFKD', str(name))
+    name = "".join(ch for ch in name if not unicodedata.combining(ch)).lower().strip()
+    name = DEFAULT_VERSION_RE.sub('', name)
+    return [word for word in NON_ALNUM_RE.split(name) if word]
+
+
+def canonical_name(name):
+    """
+    Normalize a model name so spelling variants share one key
+    e.g. "Derm Foundation", "derm-foundation" and "DermFoundation v1" -> "dermfoundation"
+    """
+    return "".join(name_words(name))
+
+
+def trigrams(key):
+    """Return the set of padded character trigrams of a canonical key"""
+    padded = f"  {key}  "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def is_extension(key, other):
+    """Return True if one key is the other with extra characters added at either end"""
+    if key == other:
+        return False
+    shorter, longer = sorted((key, other), key=len)
+    return longer.startswith(shorter) or longer.endswith(shorter)
+
+
+def edit_distance(a, b):
+    """Levenshtein distance between two short strings"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def differs_by_word(words, other):
+    """
+    Return True if two names differ by a whole word rather than a typo,
+    e.g. "ViT-B" vs "ViT-L" or "Classifier Tiny" vs "Classifier Base"
+    """
+    # Compare only the stretch between the words both names share at either end
+    start = 0
+    while start < min(len(words), len(other)) and words[start] == other[start]:
+        start += 1
+    end = 0
+    while end < min(len(words), len(other)) - start and words[-1 - end] == other[-1 - end]:
+        end += 1
+    middle = "".join(words[start:len(words) - end])
+    other_middle = "".join(other[start:len(other) - end])
+
+    shorter = min(len(middle), len(other_middle))
+    if shorter < MIN_TYPO_WORD_LENGTH:
+        return True
+    return edit_distance(middle, other_middle) > max(1, shorter // CHARS_PER_TYPO)
+
+
+def load_aliases(filename=ALIASES_FILE):
+    """Load the alias table mapping a stored model name to its known aliases"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"❌ Error reading alias file: {str(e)}")
+        return {}
+
+
+class ModelNameIndex:
+    """
+    In-memory index for resolving a user-supplied model name to a stored one.
+    Lookup order: exact name, alias, canonical key, then trigram similarity
+    (Dice coefficient) above the threshold. A fuzzy match never substitutes a
+    name that only adds or drops a prefix/suffix ("EchoCLIP-R" vs "EchoCLIP")
+    or swaps a whole word ("ViT-B" vs "ViT-L"), since those are usually
+    different models; only typos within longer words are forgiven.
+    """
+
+    def __init__(self, names=(), aliases=None, threshold=DEFAULT_SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.names = set()
+        self.aliases = {}
+        self.by_key = {}
+        self.key_trigrams = {}
+        self.postings = defaultdict(set)
+
+        for name in names:
+            self.add(name)
+        for name, name_aliases in (aliases or {}).items():
+            for alias in name_aliases:
+                self.add_alias(alias, name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name):
+        """Index a stored model name"""
+        if not name or name in self.names:
+            return
+        self.names.add(name)
+
+        key = canonical_name(name)
+        if not key or key in self.by_key:
+            return
+        self.by_key[key] = name
+
+        grams = trigrams(key)
+        self.key_trigrams[key] = grams
+        for gram in grams:
+            self.postings[gram].add(key)
+
+    def add_alias(self, alias, name):
+        """Map an alias onto a stored model name"""
+        key = canonical_name(alias)
+        if key:
+            self.aliases[key] = name
+
+    def resolve(self, query):
+        """
+        Resolve a query to a stored model name
+        Returns (name, score, match_type), or (None, 0.0, None) if nothing is close enough
+        """
+        if query in self.names:
+            return query, 1.0, "exact"
+
+        key = canonical_name(query)
+        if not key:
+            return None, 0.0, None
+        if key in self.aliases:
+            return self.aliases[key], 1.0, "alias"
+        if key in self.by_key:
+            return self.by_key[key], 1.0, "canonical"
+
+        match_key, score = self._best_fuzzy_match(query, key)
+        if match_key is None:
+            return None, 0.0, None
+        return self.by_key[match_key], score, "fuzzy"
+
+    def _best_fuzzy_match(self, query, key):
+        """Find the most similar indexed key using prefix-filtered trigram postings"""
+        query_grams = trigrams(key)
+        query_size = len(query_grams)
+        threshold = self.threshold
+
+        # Dice >= t bounds the candidate's trigram count and the overlap it needs
+        min_size = query_size * threshold / (2 - threshold)
+        max_size = query_size * (2 - threshold) / threshold
+        min_overlap = max(1, int(-(-threshold * (query_size + min_size) // 2)))
+
+        # Any key with min_overlap shared trigrams must appear in one of the
+        # (query_size - min_overlap + 1) rarest posting lists
+        rarest = sorted(query_grams, key=lambda gram: len(self.postings.get(gram, ())))
+        candidates = set()
+        for gram in rarest[:query_size - min_overlap + 1]:
+            candidates.update(self.postings.get(gram, ()))
+
+        query_digits = DIGITS_RE.findall(key)
+        query_words = name_words(query)
+        best_key, best_score = None, 0.0
+        for candidate in candidates:
+            grams = self.key_trigrams[candidate]
+            if not min_size <= len(grams) <= max_size:
+                continue
+            score = 2 * len(query_grams & grams) / (query_size + len(grams))
+            # Never merge names that differ in a version or size number, a variant suffix or a whole word
+            if (score > best_score and score >= threshold
+                    and DIGITS_RE.findall(candidate) == query_digits
+                    and not is_extension(key, candidate)
+                    and not differs_by_word(query_words, name_words(self.by_key[candidate]))):
+                best_key, best_score = candidate, score
+        return best_key, best_score
+
+
+def build_name_index(collection, threshold=DEFAULT_SIMILARITY_THRESHOLD):
+    """Build a name index from the stored card names and the alias table"""
+    names = [name for name in collection.distinct("name") if isinstance(name, str)]
+    return ModelNameIndex(names, load_aliases(), threshold)
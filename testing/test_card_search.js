@@ -0,0 +1,201 @@
+import { CardSearchIndex, FACET_FIELDS, TEXT_FIELDS, tokenize } from "../database/db/cardSearch.js";
+
+// Same cases as testing/test_card_search.py, so both implementations stay in step
+const BM25_K1 = 1.2;
+const BM25_B = 0.75;
+const AVG_LENGTH_DRIFT = 0.1;
+
+const WORDS = ["model", "skin", "lesion", "chest", "xray", "retina", "cancer", "screening", "pathology", "triage"]
+    .concat(Array.from({ length: 200 }, (_, i) => `w${i}`));
+const MODEL_TYPES = ["Foundation model", "Classifier", "Segmentation", "Detection", "Generative", "Embedding"];
+const RISK_LEVELS = ["Low", "Medium", "High", "Not found"];
+const STATUSES = ["FDA cleared", "CE marked", "Research only"];
+
+const QUERIES = ["model", "skin lesion", "model w1", "cancer screening triage", "w199", "missing term", ""];
+const FILTERS = [
+    {},
+    { clinical_risk_level: "High" },
+    { model_type: ["Classifier", "Segmentation"] },
+    { model_type: "Detection", regulatory_status: ["FDA cleared", "CE marked"] },
+    { model_type: "Embedding", clinical_risk_level: "Low", regulatory_status: "CE marked" },
+    { model_type: "No such type" },
+];
+const LIMITS = [1, 10, 50];
+
+// MINSTD generator, exact in JS doubles, so both tests generate the same cards
+class Random {
+    constructor(seed) {
+        this.seed = seed;
+    }
+
+    next() {
+        this.seed = this.seed * 48271 % 2147483647;
+        return this.seed / 2147483647;
+    }
+
+    pick(items) {
+        return items[Math.floor(this.next() * items.length)];
+    }
+
+    // Skew towards the first words so common terms appear in most cards
+    words(count) {
+        return Array.from({ length: count }, () => WORDS[Math.floor(this.next() ** 2 * WORDS.length)]);
+    }
+}
+
+function makeCard(rng, cardId, length) {
+    return {
+        _id: String(cardId),
+        name: `Model ${cardId}`,
+        summary: rng.words(length).join(" "),
+        keywords: rng.words(3),
+        use_cases: [rng.words(2).join(" ")],
+        model_limitations: rng.words(Math.floor(length / 2)).join(" "),
+        model_type: rng.pick(MODEL_TYPES),
+        clinical_risk_level: rng.pick(RISK_LEVELS),
+        regulatory_status: [rng.pick(STATUSES), rng.pick(STATUSES)],
+    };
+}
+
+// Upsert, replace and remove cards, returning the index and the cards it should hold
+function buildCards() {
+    const rng = new Random(7);
+    const index = new CardSearchIndex();
+    const cards = new Map();
+    const upsert = (card) => {
+        index.upsert(card);
+        cards.set(card._id, card);
+    };
+
+    // Arguments are evaluated in order, so these draw from the generator exactly as Python does
+    const initial = Array.from({ length: 300 }, (_, i) => makeCard(rng, i, 10));
+    index.upsertMany(initial);
+    initial.forEach((card) => cards.set(card._id, card));
+
+    for (let i = 300; i < 500; i++) upsert(makeCard(rng, i, 10 + Math.floor(rng.next() * 10)));
+    for (let i = 0; i < 100; i += 2) upsert(makeCard(rng, i, 12));
+    for (let i = 1; i < 200; i += 3) {
+        index.remove(String(i));
+        cards.delete(String(i));
+    }
+    // Longer cards move the average length enough to force an impact list rebuild
+    for (let i = 500; i < 600; i++) upsert(makeCard(rng, i, 40));
+    return { index, cards };
+}
+
+function cardFacets(card) {
+    return Object.fromEntries(FACET_FIELDS.map((field) => {
+        const values = Array.isArray(card[field]) ? card[field] : [card[field]];
+        return [field, new Set(values.filter((value) => value !== "Not found"))];
+    }));
+}
+
+// Score every card from scratch, with the average length the index scores against
+function bruteForce(index, cards, query, filters, limit) {
+    const docTerms = new Map();
+    cards.forEach((card, cardId) => {
+        const text = TEXT_FIELDS.map((field) => (Array.isArray(card[field]) ? card[field].join(" ") : card[field]));
+        const counts = new Map();
+        tokenize(text.join(" ")).forEach((term) => counts.set(term, (counts.get(term) || 0) + 1));
+        docTerms.set(cardId, counts);
+    });
+    const terms = [...new Set(tokenize(query))];
+
+    const scores = new Map();
+    cards.forEach((card, cardId) => {
+        const facets = cardFacets(card);
+        const passes = Object.entries(filters).every(([field, value]) =>
+            (Array.isArray(value) ? value : [value]).some((item) => facets[field].has(item)));
+        const counts = docTerms.get(cardId);
+        const present = terms.filter((term) => counts.has(term));
+        if (!passes || (terms.length > 0 && present.length === 0)) return;
+
+        const length = [...counts.values()].reduce((sum, count) => sum + count, 0);
+        let score = 0;
+        present.forEach((term) => {
+            const docCount = [...docTerms.values()].filter((other) => other.has(term)).length;
+            const idf = Math.log(1 + (cards.size - docCount + 0.5) / (docCount + 0.5));
+            const norm = BM25_K1 * (1 - BM25_B + BM25_B * length / index.scoringAvgLength);
+            const freq = counts.get(term);
+            score += idf * freq * (BM25_K1 + 1) / (freq + norm);
+        });
+        scores.set(cardId, Math.round(score * 10000) / 10000);
+    });
+
+    const facetCounts = Object.fromEntries(FACET_FIELDS.map((field) => [field, {}]));
+    scores.forEach((score, cardId) => {
+        Object.entries(cardFacets(cards.get(cardId))).forEach(([field, values]) => {
+            values.forEach((value) => { facetCounts[field][value] = (facetCounts[field][value] || 0) + 1; });
+        });
+    });
+    const topScores = [...scores.values()].sort((a, b) => b - a).slice(0, limit);
+    return { total: scores.size, scores, topScores, facets: facetCounts };
+}
+
+// Facet objects compared without regard to key order
+function sameFacets(a, b) {
+    const normalize = (facets) => JSON.stringify(
+        Object.keys(facets).sort().map((field) => [field, Object.entries(facets[field]).sort()])
+    );
+    return normalize(a) === normalize(b);
+}
+
+let failures = 0;
+const check = (ok, message) => {
+    if (!ok) {
+        failures++;
+        console.log(`❌ ${message}`);
+    }
+};
+
+// Matches brute force after updates
+{
+    const { index, cards } = buildCards();
+    check(index.size === cards.size, `index holds ${index.size} cards, expected ${cards.size}`);
+    QUERIES.forEach((query) => FILTERS.forEach((filters) => LIMITS.forEach((limit) => {
+        const response = index.search(query, filters, limit);
+        const expected = bruteForce(index, cards, query, filters, limit);
+        const label = `${JSON.stringify(query)} ${JSON.stringify(filters)} limit=${limit}`;
+        check(response.total === expected.total, `${label}: total ${response.total} != ${expected.total}`);
+        check(sameFacets(response.facets, expected.facets), `${label}: facets differ`);
+        if (query) {
+            const scores = response.results.map((result) => result.score);
+            check(JSON.stringify(scores) === JSON.stringify(expected.topScores), `${label}: scores differ`);
+        } else {
+            check(response.results.length === Math.min(limit, expected.total), `${label}: wrong page size`);
+        }
+        check(response.results.every((result) => expected.scores.get(result.id) === result.score), label);
+    })));
+}
+
+// Impact lists are rebuilt when the average length drifts
+{
+    const { index } = buildCards();
+    const avgLength = index.totalLength / index.size;
+    check(Math.abs(avgLength - index.scoringAvgLength) <= AVG_LENGTH_DRIFT * index.scoringAvgLength,
+        `average length ${avgLength} drifted from ${index.scoringAvgLength}`);
+    index.impacts.forEach((impacts, term) => {
+        const ordered = impacts.every((entry, i) => i === 0
+            || impacts[i - 1][0] < entry[0] || (impacts[i - 1][0] === entry[0] && impacts[i - 1][1] <= entry[1]));
+        check(ordered, `impact list for "${term}" is out of order`);
+        const ids = new Set(impacts.map(([, cardId]) => cardId));
+        const postings = index.postings.get(term) || new Map();
+        check(ids.size === postings.size && [...ids].every((cardId) => postings.has(cardId)),
+            `stale impacts for "${term}"`);
+    });
+}
+
+// Removed cards leave no trace
+{
+    const { index, cards } = buildCards();
+    cards.forEach((card, cardId) => index.remove(cardId));
+    check(index.size === 0 && index.totalLength === 0, "index not empty after removing every card");
+    check([...index.postings.values()].every((postings) => postings.size === 0), "postings left behind");
+    check([...index.impacts.values()].every((impacts) => impacts.length === 0), "impacts left behind");
+    check([...index.facets.values()].every((values) => values.size === 0), "facet values left behind");
+    const response = index.search("model");
+    check(response.total === 0 && response.results.length === 0, "removed cards still match");
+}
+
+console.log(failures ? `❌ ${failures} card search check(s) failed` : "✅ All card search checks passed");
+process.exit(failures ? 1 : 0);
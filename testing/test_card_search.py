@@ -0,0 +1,182 @@
+import math
+import os
+import sys
+from collections import Counter
+
+# Allow running from the project root or from inside testing/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.card_search import AVG_LENGTH_DRIFT, BM25_B, BM25_K1, FACET_FIELDS, TEXT_FIELDS, CardSearchIndex, tokenize
+
+# Same cases as testing/test_card_search.js, so both implementations stay in step
+WORDS = ["model", "skin", "lesion", "chest", "xray", "retina", "cancer", "screening", "pathology", "triage"] + [
+    f"w{i}" for i in range(200)
+]
+MODEL_TYPES = ["Foundation model", "Classifier", "Segmentation", "Detection", "Generative", "Embedding"]
+RISK_LEVELS = ["Low", "Medium", "High", "Not found"]
+STATUSES = ["FDA cleared", "CE marked", "Research only"]
+
+QUERIES = ["model", "skin lesion", "model w1", "cancer screening triage", "w199", "missing term", ""]
+FILTERS = [
+    {},
+    {"clinical_risk_level": "High"},
+    {"model_type": ["Classifier", "Segmentation"]},
+    {"model_type": "Detection", "regulatory_status": ["FDA cleared", "CE marked"]},
+    {"model_type": "Embedding", "clinical_risk_level": "Low", "regulatory_status": "CE marked"},
+    {"model_type": "No such type"},
+]
+LIMITS = [1, 10, 50]
+
+
+class Random:
+    """MINSTD generator, exact in JS doubles too, so both tests generate the same cards"""
+
+    def __init__(self, seed):
+        self.seed = seed
+
+    def next(self):
+        self.seed = self.seed * 48271 % 2147483647
+        return self.seed / 2147483647
+
+    def pick(self, items):
+        return items[int(self.next() * len(items))]
+
+    def words(self, count):
+        # Skew towards the first words so common terms appear in most cards
+        return [WORDS[int(self.next() ** 2 * len(WORDS))] for _ in range(count)]
+
+
+def make_card(rng, card_id, length):
+    return {
+        "_id": str(card_id),
+        "name": f"Model {card_id}",
+        "summary": " ".join(rng.words(length)),
+        "keywords": rng.words(3),
+        "use_cases": [" ".join(rng.words(2))],
+        "model_limitations": " ".join(rng.words(length // 2)),
+        "model_type": rng.pick(MODEL_TYPES),
+        "clinical_risk_level": rng.pick(RISK_LEVELS),
+        "regulatory_status": [rng.pick(STATUSES), rng.pick(STATUSES)],
+    }
+
+
+def build_cards():
+    """Upsert, replace and remove cards, returning the index and the cards it should hold"""
+    rng = Random(7)
+    index = CardSearchIndex()
+    cards = {}
+
+    def upsert(card):
+        index.upsert(card)
+        cards[card["_id"]] = card
+
+    initial = [make_card(rng, i, 10) for i in range(300)]
+    index.upsert_many(initial)
+    cards.update({card["_id"]: card for card in initial})
+
+    for i in range(300, 500):
+        upsert(make_card(rng, i, 10 + int(rng.next() * 10)))
+    for i in range(0, 100, 2):
+        upsert(make_card(rng, i, 12))
+    for i in range(1, 200, 3):
+        index.remove(str(i))
+        cards.pop(str(i))
+    # Longer cards move the average length enough to force an impact list rebuild
+    for i in range(500, 600):
+        upsert(make_card(rng, i, 40))
+    return index, cards
+
+
+def card_facets(card):
+    facets = {}
+    for field in FACET_FIELDS:
+        values = card[field] if isinstance(card[field], list) else [card[field]]
+        facets[field] = {value for value in values if value != "Not found"}
+    return facets
+
+
+def brute_force(index, cards, query, filters, limit):
+    """Score every card from scratch, with the average length the index scores against"""
+    doc_terms = {
+        card_id: Counter(tokenize(" ".join(
+            " ".join(card[field]) if isinstance(card[field], list) else card[field] for field in TEXT_FIELDS
+        )))
+        for card_id, card in cards.items()
+    }
+    terms = set(tokenize(query))
+    allowed = []
+    for card_id, card in cards.items():
+        facets = card_facets(card)
+        if all(facets[field] & ({value} if isinstance(value, str) else set(value)) for field, value in filters.items()):
+            allowed.append(card_id)
+
+    scores = {}
+    for card_id in allowed:
+        counts = doc_terms[card_id]
+        if terms and not terms & counts.keys():
+            continue
+        length = sum(counts.values())
+        score = 0.0
+        for term in terms & counts.keys():
+            doc_count = sum(1 for other in doc_terms.values() if term in other)
+            idf = math.log(1 + (len(cards) - doc_count + 0.5) / (doc_count + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / index.scoring_avg_length)
+            score += idf * counts[term] * (BM25_K1 + 1) / (counts[term] + norm)
+        scores[card_id] = round(score, 4)
+
+    facet_counts = {field: Counter() for field in FACET_FIELDS}
+    for card_id in scores:
+        for field, values in card_facets(cards[card_id]).items():
+            facet_counts[field].update(values)
+    top_scores = sorted(scores.values(), reverse=True)[:limit]
+    return len(scores), scores, top_scores, {field: dict(counts) for field, counts in facet_counts.items()}
+
+
+def test_matches_brute_force_after_updates():
+    index, cards = build_cards()
+    assert len(index) == len(cards)
+    for query in QUERIES:
+        for filters in FILTERS:
+            for limit in LIMITS:
+                response = index.search(query, filters, limit)
+                total, scores, top_scores, facets = brute_force(index, cards, query, filters, limit)
+                case = f"{query!r} {filters} limit={limit}"
+                assert response["total"] == total, f"{case}: total {response['total']} != {total}"
+                assert response["facets"] == facets, f"{case}: facets differ"
+                if query:
+                    assert [result["score"] for result in response["results"]] == top_scores, f"{case}: scores differ"
+                else:
+                    assert len(response["results"]) == min(limit, total), f"{case}: wrong page size"
+                assert all(scores[result["id"]] == result["score"] for result in response["results"]), case
+
+
+def test_impacts_rebuilt_when_average_length_drifts():
+    index, cards = build_cards()
+    avg_length = index.total_length / len(index)
+    assert abs(avg_length - index.scoring_avg_length) <= AVG_LENGTH_DRIFT * index.scoring_avg_length
+    for term, impacts in index.impacts.items():
+        assert impacts == sorted(impacts), f"impact list for {term!r} is out of order"
+        assert {card_id for _, card_id in impacts} == index.postings[term].keys(), f"stale impacts for {term!r}"
+
+
+def test_removed_cards_leave_no_trace():
+    index, cards = build_cards()
+    for card_id in list(cards):
+        index.remove(card_id)
+    assert len(index) == 0 and index.total_length == 0
+    assert not any(index.postings.values()) and not any(index.impacts.values())
+    assert all(not values for values in index.facets.values())
+    assert index.search("model") == {"total": 0, "results": [], "facets": {field: {} for field in FACET_FIELDS}}
+
+
+if __name__ == "__main__":
+    failures = 0
+    for test in [test_matches_brute_force_after_updates, test_impacts_rebuilt_when_average_length_drifts,
+                 test_removed_cards_leave_no_trace]:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    exit(1 if failures else 0)
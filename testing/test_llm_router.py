@@ -0,0 +1,265 @@
+import csv
+import json
+import os
+import sys
+import threading
+import time
+
+# Allow running from the project root or from inside testing/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.llm_router import HARD_FIELDS, LIST_FIELDS, ModelTier, TieredExtractor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONTENT = "Copyright 2019-01-01. Derm Foundation was released March 3, 2024. Training dataset: 10.5281/zenodo.123."
+
+# Fixed instruction text of the single Gemini call fill_card made before routing,
+# i.e. that prompt's length minus the page content and the field list
+SINGLE_CALL_INSTRUCTION_CHARS = 2581
+# USD per million tokens, as in fill_card.MODEL_TIERS; the single call used the strong model
+FAST_PRICES, STRONG_PRICES = (0.075, 0.30), (0.10, 0.40)
+
+
+class StubBackend:
+    """Backend that answers every requested field from a table instead of calling Gemini"""
+
+    def __init__(self, answers=None, error=None, raw_text=None, delay=0.0, tokens=None):
+        self.answers = answers or {}
+        self.error = error
+        self.raw_text = raw_text
+        self.delay = delay
+        self.tokens = tokens
+        self.requested = []
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def generate(self, prompt):
+        fields = prompt.split("**Fields:** ")[1].split("\n")[0].split(", ")
+        with self.lock:
+            self.requested.append(fields)
+            self.prompts.append(prompt)
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        if self.raw_text is not None:
+            text = self.raw_text
+        else:
+            response = {field: self.answers[field] for field in fields if field in self.answers}
+            text = "```json\n" + json.dumps(response) + "\n```"
+        return text, *(self.tokens or (estimate_tokens(prompt), estimate_tokens(text)))
+
+
+def estimate_tokens(text):
+    """Rough Gemini token count, about four characters per token"""
+    return len(text) // 4
+
+
+def load_wanted_fields():
+    with open(os.path.join(ROOT, "list_of_wanted_fields.csv"), encoding="utf-8") as file:
+        for row in csv.reader(file):
+            if row and not row[0].strip().startswith("//"):
+                return [field.strip() for field in row if field.strip()]
+
+
+def make_router(fast, strong, fast_prices=(1.0, 2.0), strong_prices=(10.0, 20.0)):
+    return TieredExtractor([
+        ModelTier("fast", fast, "fast-model", *fast_prices),
+        ModelTier("strong", strong, "strong-model", *strong_prices),
+    ])
+
+
+def run(router, fields, content=CONTENT, developer_name="Google"):
+    return router.extract(fields, content, "Derm Foundation", developer_name)
+
+
+def test_extractors_short_circuit():
+    fast, strong = StubBackend(), StubBackend()
+    values, report = run(make_router(fast, strong), ["model_name", "developer_name", "release_date", "doi_dataset_used"])
+
+    assert values == {
+        "model_name": "Derm Foundation",
+        "developer_name": "Google",
+        "release_date": "2024-03-03",
+        "doi_dataset_used": "10.5281/zenodo.123",
+    }
+    assert all(decision["source"] == "extractor" for decision in report["decisions"].values())
+    assert fast.requested == [] and strong.requested == []
+
+
+def test_uncued_hits_and_placeholder_developer_go_to_model():
+    fast = StubBackend({
+        "developer_name": {"value": "Google Health", "confidence": 0.9},
+        "release_date": {"value": "2024-03-03", "confidence": 0.9},
+    })
+    values, report = run(
+        make_router(fast, StubBackend()), ["developer_name", "release_date"],
+        content="Copyright 2019-01-01.", developer_name="Unknown Developer",
+    )
+
+    assert values == {"developer_name": "Google Health", "release_date": "2024-03-03"}
+    assert "release_date: 2019-01-01" in fast.prompts[0]
+
+
+def test_hard_fields_go_straight_to_strong_tier_in_parallel():
+    fast = StubBackend({"summary": {"value": "A model", "confidence": 0.9}}, delay=0.2)
+    strong = StubBackend({"known_biases": {"value": "Skin tone", "confidence": 0.9}}, delay=0.2)
+    values, report = run(make_router(fast, strong), ["summary", "known_biases"])
+
+    assert fast.requested == [["summary"]]
+    assert strong.requested == [["known_biases"]]
+    assert report["decisions"]["known_biases"]["attempts"] == ["strong"]
+    assert report["total_latency_s"] < 0.35
+
+
+def test_escalation_on_invalid_missing_or_low_confidence():
+    fast = StubBackend({
+        "summary": {"value": "A model", "confidence": 0.9},
+        "purpose": {"value": "Maybe triage", "confidence": 0.2},
+        "release_date": {"value": "last spring", "confidence": 0.9},
+        "how_to_use": "See docs",
+    })
+    strong = StubBackend({
+        "purpose": {"value": "Skin triage", "confidence": 0.8},
+        "release_date": "2024-03-03",
+        "use_cases": ["Triage"],
+    })
+    values, report = run(
+        make_router(fast, strong), ["summary", "purpose", "release_date", "how_to_use", "use_cases"],
+        content="No dates here.",
+    )
+
+    assert strong.requested == [["purpose", "release_date", "use_cases"]]
+    assert values["summary"] == "A model"
+    assert values["how_to_use"] == "See docs"
+    assert values["purpose"] == "Skin triage"
+    assert values["release_date"] == "2024-03-03"
+    assert values["use_cases"] == ["Triage"]
+    assert report["decisions"]["purpose"]["attempts"] == ["fast", "strong"]
+    assert report["rounds"] == 2
+
+
+def test_confident_not_found_is_accepted():
+    fast = StubBackend({"irb_approval": {"value": "Not found", "confidence": 0.95}, "funding_source": "Not found"})
+    strong = StubBackend()
+    values, report = run(make_router(fast, strong), ["irb_approval", "funding_source"])
+
+    assert values == {"irb_approval": "Not found", "funding_source": "Not found"}
+    assert strong.requested == []
+    assert report["decisions"]["irb_approval"] == {"source": "fast", "confidence": 0.95, "attempts": ["fast"]}
+    assert report["rounds"] == 1
+
+
+def test_comma_separated_list_fields_are_split():
+    fast = StubBackend({"keywords": {"value": "dermatology, skin", "confidence": 0.9}})
+    strong = StubBackend()
+    values, report = run(make_router(fast, strong), ["keywords"])
+
+    assert values == {"keywords": ["dermatology", "skin"]}
+    assert strong.requested == []
+    assert "JSON lists of strings for keywords" in fast.prompts[0]
+
+
+def test_best_guess_fallback():
+    fast = StubBackend({"purpose": {"value": "Maybe triage", "confidence": 0.3}})
+    strong = StubBackend({"purpose": {"value": "Not found", "confidence": 0.0}})
+    values, report = run(make_router(fast, strong), ["purpose", "ethical_review"])
+
+    assert values["purpose"] == "Maybe triage"
+    assert report["decisions"]["purpose"]["source"] == "fast"
+    assert values["ethical_review"] == "Not found"
+    assert report["decisions"]["ethical_review"]["source"] is None
+
+
+def test_fallback_keeps_reported_confidence():
+    fast = StubBackend({"purpose": {"value": "Not found", "confidence": 0.2}})
+    strong = StubBackend({"purpose": {"value": "Not found", "confidence": 0.1}})
+    values, report = run(make_router(fast, strong), ["purpose"])
+
+    assert values["purpose"] == "Not found"
+    assert report["decisions"]["purpose"]["confidence"] == 0.1
+    assert report["decisions"]["purpose"]["reason"] == "empty"
+
+
+def test_backend_exceptions_and_bad_json():
+    fast = StubBackend(error=RuntimeError("quota exceeded"))
+    strong = StubBackend(raw_text="not json")
+    values, report = run(make_router(fast, strong), ["summary", "known_biases"])
+
+    assert values == {"summary": "Not found", "known_biases": "Not found"}
+    assert report["tiers"]["fast"]["failed_calls"] == 1
+    assert report["tiers"]["strong"]["failed_calls"] == 2
+
+
+def test_tier_accounting():
+    fast = StubBackend({"summary": {"value": "A model", "confidence": 0.2}}, tokens=(1000, 500))
+    strong = StubBackend({"summary": {"value": "A model", "confidence": 0.9}}, tokens=(2000, 1000))
+    values, report = run(make_router(fast, strong), ["summary"])
+
+    fast_stats, strong_stats = report["tiers"]["fast"], report["tiers"]["strong"]
+    assert (fast_stats["calls"], fast_stats["fields_requested"], fast_stats["fields_accepted"]) == (1, 1, 0)
+    assert (strong_stats["calls"], strong_stats["fields_requested"], strong_stats["fields_accepted"]) == (1, 1, 1)
+    assert (fast_stats["input_tokens"], fast_stats["output_tokens"]) == (1000, 500)
+    assert fast_stats["cost_usd"] == 0.002
+    assert strong_stats["cost_usd"] == 0.04
+    assert report["total_cost_usd"] == 0.042
+    assert fast_stats["latency_s"] >= 0 and report["total_latency_s"] >= 0
+
+
+def route_card(escalated):
+    """Route a full card whose fast-tier answers for the escalated fields are weak guesses"""
+    fields = load_wanted_fields()
+    content = ("Derm Foundation is a machine learning model that produces embeddings for dermatology images. "
+               "It was trained on de-identified images from several countries and supports classifiers for "
+               "skin conditions with less data and compute. ") * 2
+    content = content[:500] + "..."
+    answers = {field: f"Answer about {field.replace('_', ' ')} for Derm Foundation" for field in fields}
+    answers.update({field: [answers[field]] for field in LIST_FIELDS & set(fields)}, release_date="2024-03-03")
+    weak = {field: {"value": "Maybe", "confidence": 0.2} for field in escalated}
+    fast, strong = StubBackend(dict(answers, **weak)), StubBackend(answers)
+    values, report = run(make_router(fast, strong, FAST_PRICES, STRONG_PRICES), fields, content=content)
+
+    # One strong-tier call with the old long prompt, answering every field as a bare value
+    single_input = estimate_tokens(" " * SINGLE_CALL_INSTRUCTION_CHARS + content + ", ".join(fields))
+    single_output = estimate_tokens("```json\n" + json.dumps(answers) + "\n```")
+    single_cost = (single_input * STRONG_PRICES[0] + single_output * STRONG_PRICES[1]) / 1_000_000
+
+    tiers = report["tiers"].values()
+    input_tokens = sum(stats["input_tokens"] for stats in tiers)
+    output_tokens = sum(stats["output_tokens"] for stats in tiers)
+    print(f"   single call: {single_input} in / {single_output} out tokens, ${single_cost:.6f}, 1 round trip")
+    print(f"   tiered:      {input_tokens} in / {output_tokens} out tokens, "
+          f"${report['total_cost_usd']:.6f}, {report['rounds']} round trip(s)")
+
+    model_fields = [field for field in fields if report["decisions"][field]["source"] != "extractor"]
+    assert {field: values[field] for field in model_fields} == {field: answers[field] for field in model_fields}
+    assert input_tokens < single_input
+    # Only the discarded weak guesses are answered twice
+    assert output_tokens <= single_output + estimate_tokens(json.dumps(weak))
+    assert report["total_cost_usd"] < single_cost
+    return report, strong
+
+
+def test_cheaper_than_single_call():
+    report, strong = route_card([])
+    # Hard fields run alongside the fast tier, so a card with no weak guesses is one round trip
+    assert report["rounds"] == 1
+    assert [len(group) for group in strong.requested] == [len(HARD_FIELDS & set(load_wanted_fields()))]
+
+
+def test_escalation_still_cheaper_than_single_call():
+    report, strong = route_card(["purpose", "ethical_review"])
+    assert report["rounds"] == 2
+    assert strong.requested[-1] == ["purpose", "ethical_review"]
+
+
+if __name__ == "__main__":
+    tests = [value for name, value in list(globals().items()) if name.startswith("test_")]
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    exit(1 if failures else 0)
@@ -0,0 +1,45 @@
+import { ModelNameIndex } from "../database/db/nameIndex.js";
+
+// Same cases as testing/test_name_index.py, so both implementations stay in step
+const STORED_NAMES = [
+    "Derm Foundation", "DermaSensor", "MedGemma 4B", "Med-PaLM", "EchoCLIP", "RETFound", "Virchow",
+    "BiomedCLIP ViT-B", "Chest X-ray Classifier Base", "Pathology Foundation Model A",
+];
+const ALIASES = { "Derm Foundation": ["Google Derm Foundation"] };
+
+const SAME_MODEL = [
+    ["Derm Foundation", "Derm Foundation", "exact"],
+    ["derm-foundation", "Derm Foundation", "canonical"],
+    ["DermFoundation v1", "Derm Foundation", "canonical"],
+    ["Google Derm Foundation", "Derm Foundation", "alias"],
+    ["Derm Foundaton", "Derm Foundation", "fuzzy"],
+    ["Dermasensr", "DermaSensor", "fuzzy"],
+    ["Chest Xray Clasifier Base", "Chest X-ray Classifier Base", "fuzzy"],
+];
+
+const DIFFERENT_MODEL = [
+    "Med-PaLM M", "EchoCLIP-R", "RETFound-MEH", "Virchow G", "Derm Foundation Lite", "MedGemma 7B",
+    "BiomedCLIP ViT-L", "Chest X-ray Classifier Tiny", "Pathology Foundation Model B",
+];
+
+const index = new ModelNameIndex(STORED_NAMES, ALIASES);
+let failures = 0;
+
+SAME_MODEL.forEach(([query, expectedName, expectedType]) => {
+    const { name, matchType } = index.resolve(query);
+    if (name !== expectedName || matchType !== expectedType) {
+        failures++;
+        console.log(`❌ "${query}" -> "${name}" (${matchType}), expected "${expectedName}" (${expectedType})`);
+    }
+});
+
+DIFFERENT_MODEL.forEach((query) => {
+    const { name, matchType, score } = index.resolve(query);
+    if (name !== null) {
+        failures++;
+        console.log(`❌ "${query}" wrongly matched "${name}" (${matchType}, ${score.toFixed(2)})`);
+    }
+});
+
+console.log(failures ? `❌ ${failures} name resolution case(s) failed` : "✅ All name resolution cases passed");
+process.exit(failures ? 1 : 0);
@@ -0,0 +1,60 @@
+import os
+import sys
+
+# Allow running from the project root or from inside testing/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.name_index import ModelNameIndex
+
+STORED_NAMES = [
+    "Derm Foundation", "DermaSensor", "MedGemma 4B", "Med-PaLM", "EchoCLIP", "RETFound", "Virchow",
+    "BiomedCLIP ViT-B", "Chest X-ray Classifier Base", "Pathology Foundation Model A",
+]
+ALIASES = {"Derm Foundation": ["Google Derm Foundation"]}
+
+# Spelling variants that must resolve to the stored card
+SAME_MODEL = [
+    ("Derm Foundation", "Derm Foundation", "exact"),
+    ("derm-foundation", "Derm Foundation", "canonical"),
+    ("DermFoundation v1", "Derm Foundation", "canonical"),
+    ("Google Derm Foundation", "Derm Foundation", "alias"),
+    ("Derm Foundaton", "Derm Foundation", "fuzzy"),
+    ("Dermasensr", "DermaSensor", "fuzzy"),
+    ("Chest Xray Clasifier Base", "Chest X-ray Classifier Base", "fuzzy"),
+]
+
+# Different models that must not be served another model's card
+DIFFERENT_MODEL = [
+    "Med-PaLM M", "EchoCLIP-R", "RETFound-MEH", "Virchow G", "Derm Foundation Lite", "MedGemma 7B",
+    "BiomedCLIP ViT-L", "Chest X-ray Classifier Tiny", "Pathology Foundation Model B",
+]
+
+
+def make_index():
+    return ModelNameIndex(STORED_NAMES, ALIASES)
+
+
+def test_spelling_variants_resolve():
+    index = make_index()
+    for query, expected_name, expected_type in SAME_MODEL:
+        name, score, match_type = index.resolve(query)
+        assert (name, match_type) == (expected_name, expected_type), f"{query!r} -> {name!r} ({match_type})"
+
+
+def test_variant_models_do_not_resolve():
+    index = make_index()
+    for query in DIFFERENT_MODEL:
+        name, score, match_type = index.resolve(query)
+        assert name is None, f"{query!r} wrongly matched {name!r} ({match_type}, {score:.2f})"
+
+
+if __name__ == "__main__":
+    failures = 0
+    for test in [test_spelling_variants_resolve, test_variant_models_do_not_resolve]:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+    exit(1 if failures else 0)